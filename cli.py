@@ -15,9 +15,10 @@ from pipelines.steps.persist_people import PersistPeople
 from services.domain_utils import normalize_linkedin_profile_url
 from services.mapping import map_to_person_schema
 from services.reporting import print_summary
-from services.enrichment_service import fetch_company_enrichment, fetch_company_enrichment_linkup
+from services.enrichment_service import fetch_company_enrichment, fetch_company_enrichment_batch, fetch_company_enrichment_linkup
 from config.settings import get_settings
 from utils.logging_setup import init_logging
+from utils.llm_logger import flush_usage, refresh_run_id
 from pipelines.steps.validate_data import DataValidator
 from sources.registry import get_source
 import os
@@ -71,16 +72,21 @@ def cmd_enrich(args):
     provider = (settings.ai_provider or "stub").lower()
 
     if provider in ("openai", "linkup"):
-        def _gateway_fetch(name: str, domain: str):
-            # Central gateway handles provider routing (OpenAI or Linkup) per config routes
-            data = fetch_company_enrichment(name, domain)
-            return data if data else _stub_fetcher(name, domain)
-        fetcher = _gateway_fetch
+        # Central gateway handles provider routing (OpenAI or Linkup) per config routes.
+        # No stub fallback: missing data must reach the pipeline's fail-fast check.
+        # The response cache lives in this run's DB (--db), not settings.db_path.
+        def fetcher(name, domain):
+            return fetch_company_enrichment(name, domain, db_path=args.db)
+
+        def batch_fetcher(items):
+            # Concurrent provider calls (async gateway)
+            return fetch_company_enrichment_batch(items, db_path=args.db)
     else:
         # Stub provider allowed only in test environment
         if (settings.run_env or "").lower() != "test":
             raise RuntimeError("Stub enrichment provider is only allowed when RUN_ENV=test")
         fetcher = _stub_fetcher
+        batch_fetcher = None
 
     def _progress(cur, total, company_id, name):
         print(f"[{cur}/{total}] Enriching company_id={company_id} name={name}")
@@ -88,10 +94,12 @@ def cmd_enrich(args):
     ctx = RunContext()
     pipeline = Pipeline([
         LoadPendingCompanies(conn, limit=getattr(args, "limit", 50)),
-        EnrichAndPersistCompanies(conn, fetcher, on_progress=_progress if getattr(args, "progress", False) else None),
+        EnrichAndPersistCompanies(conn, fetcher, on_progress=_progress if getattr(args, "progress", False) else None, batch_fetch_func=batch_fetcher),
     ])
     ctx = pipeline.run(ctx)
     updated = int(ctx.meta.get("companies_enriched") or 0)
+    # Per-run LLM usage counted in memory lands in this run's DB
+    flush_usage(conn)
     print(f"Enriched {updated} companies")
 
 def cmd_report_person(args):
@@ -132,6 +140,7 @@ def cmd_run(args):
 			os.environ["RUN_ID"] = _uuid.uuid4().hex
 		except Exception:
 			pass
+	refresh_run_id()
 	if args.pipeline == "ingest-people":
 		# Determine search terms
 		if args.query:
@@ -176,7 +185,7 @@ def cmd_run(args):
 			api_usage,
 			None
 		)
-		print_summary(output_data, api_usage)
+		print_summary(output_data, api_usage, db_path=args.db)
 		if args.write_db:
 			conn = get_connection(args.db)
 			schema.bootstrap(conn)
@@ -202,6 +211,7 @@ def cmd_run(args):
 				])
 				cctx = cpipeline.run(cctx)
 				processed_companies = int(cctx.meta.get('processed_companies') or 0)
+			flush_usage(conn)
 			print(f"DB write complete: people={processed_people}, companies={processed_companies}")
 		return
 	elif args.pipeline == "enrich-companies":
@@ -316,9 +326,22 @@ def cmd_dedupe_people(args):
     conn.commit()
     print(f"Merged {merged} duplicate person rows")
 
-def main():
-    settings = get_settings()
-    init_logging(settings.log_level)
+# Subcommand name -> handler; used by run() when args were not built by argparse
+COMMANDS = {
+    "bootstrap": cmd_bootstrap,
+    "ingest": cmd_ingest,
+    "enrich": cmd_enrich,
+    "report-person": cmd_report_person,
+    "report-recent": cmd_report_recent,
+    "dedupe-people": cmd_dedupe_people,
+    "run": cmd_run,
+}
+
+
+def build_parser(settings=None) -> argparse.ArgumentParser:
+    """Build the CLI argument parser (defaults taken from settings)."""
+    if settings is None:
+        settings = get_settings()
     parser = argparse.ArgumentParser(description="Lead DB CLI")
     parser.add_argument("--db", default=settings.db_path, help="Path to SQLite DB (default from settings)")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -363,9 +386,19 @@ def main():
     p_run.add_argument('--limit', type=int, default=10, help='Max companies to enrich (default: 10)')
     p_run.add_argument('--progress', action='store_true', help='Print progress for each company')
     p_run.set_defaults(func=cmd_run)
+    return parser
 
-    args = parser.parse_args()
-    args.func(args)
+
+def run(args: argparse.Namespace) -> None:
+    """Dispatch a parsed (or hand-built) Namespace to its subcommand handler."""
+    func = getattr(args, "func", None) or COMMANDS[args.cmd]
+    func(args)
+
+
+def main():
+    settings = get_settings()
+    init_logging(settings.log_level)
+    run(build_parser(settings).parse_args())
 
 
 if __name__ == "__main__":
@@ -16,7 +16,7 @@ def _load_env() -> None:
     load_dotenv()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     google_api_key: str | None
     google_cse_id: str | None
@@ -66,6 +66,10 @@ class Settings:
     llm_trace: bool = False
     llm_log_path: str = "logs/llm_calls.jsonl"
 
+    # LLM response cache (SQLite table llm_cache in db_path)
+    llm_cache_enabled: bool = False
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+
     # Feature flags
     demo: bool = False
 
@@ -133,7 +137,17 @@ def get_settings() -> Settings:
         google_places_details_url=os.getenv("GOOGLE_PLACES_DETAILS_URL", "https://maps.googleapis.com/maps/api/place/details/json"),
         llm_trace=os.getenv("LLM_TRACE", "false").lower() in ("1", "true", "yes", "on"),
         llm_log_path=os.getenv("LLM_LOG_PATH", "logs/llm_calls.jsonl"),
+        llm_cache_enabled=os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes", "on"),
+        llm_cache_ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
         demo=os.getenv("DEMO", "false").lower() in ("1", "true", "yes", "on"),
     )
 
 
+def get_setting(name: str):
+    """Single setting from the cached Settings (no env re-parsing)."""
+    return getattr(get_settings(), name)
+
+
+def invalidate_settings_cache() -> None:
+    """Drop the cached Settings so the next get_settings() re-reads the env (tests)."""
+    get_settings.cache_clear()
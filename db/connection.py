@@ -4,18 +4,30 @@ import sqlite3
 from typing import Optional
 
 
-def get_connection(db_path: str, timeout: Optional[float] = 30.0) -> sqlite3.Connection:
+_CACHED_STATEMENTS = 256
+
+def get_connection(db_path: str, timeout: Optional[float] = 30.0, check_same_thread: bool = True) -> sqlite3.Connection:
     """Open a SQLite connection with sane pragmas for concurrent local use.
 
     - WAL journal for fewer writer blocks
     - NORMAL synchronous for performance
     - foreign_keys ON to enforce integrity
+    - 64 MiB page cache, in-memory temp store and 256 MiB mmap for bulk upserts
+    - 256-entry prepared-statement cache (pipelines cycle through many statements)
     """
-    conn = sqlite3.connect(db_path, timeout=timeout or 30.0)
+    conn = sqlite3.connect(
+        db_path,
+        timeout=timeout or 30.0,
+        check_same_thread=check_same_thread,
+        cached_statements=_CACHED_STATEMENTS,
+    )
     # Pragmas
     conn.execute("PRAGMA journal_mode=WAL;")
     conn.execute("PRAGMA synchronous=NORMAL;")
     conn.execute("PRAGMA foreign_keys=ON;")
+    conn.execute("PRAGMA cache_size=-65536;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=268435456;")
     return conn
 
 
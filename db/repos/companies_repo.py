@@ -1,7 +1,65 @@
 from __future__ import annotations
 
+import json
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Rows per executemany/IN-list chunk for the batch upsert
+_BATCH_SIZE = 500
+
+# Same merge rules as upsert_by_domain; NULL domains never conflict, so those rows
+# are plain inserts and go through _INSERT_NO_DOMAIN_SQL to get their ids.
+_UPSERT_BY_DOMAIN_SQL = (
+    "INSERT INTO companies (name, domain, website, source_name, source_query, search_query_id) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(domain) DO UPDATE SET "
+    "name = COALESCE(excluded.name, companies.name), "
+    "website = COALESCE(excluded.website, companies.website), "
+    "source_name = COALESCE(excluded.source_name, companies.source_name), "
+    "source_query = COALESCE(excluded.source_query, companies.source_query), "
+    "search_query_id = COALESCE(excluded.search_query_id, companies.search_query_id)"
+)
+_INSERT_NO_DOMAIN_SQL = "INSERT INTO companies (name, source_name, source_query, search_query_id) VALUES (?, ?, ?, ?)"
+
+_SELECT_BY_DOMAIN_SQL = "SELECT id, name, website FROM companies WHERE domain = ?"
+_UPDATE_BY_ID_SQL = (
+    "UPDATE companies SET name = COALESCE(?, name), website = COALESCE(?, website), source_name = COALESCE(?, source_name), "
+    "source_query = COALESCE(?, source_query), search_query_id = COALESCE(?, search_query_id) WHERE id = ?"
+)
+_INSERT_WITH_DOMAIN_SQL = "INSERT INTO companies (name, domain, website, source_name, source_query, search_query_id) VALUES (?, ?, ?, ?, ?, ?)"
+
+# Enrichment columns in update order; *_json columns take lists/dicts as JSON text
+_ENRICHMENT_COLUMNS = (
+    "legal_form",
+    "industries_json",
+    "locations_de_json",
+    "multinational",
+    "domain",
+    "website",
+    "size_employees",
+    "business_model_json",
+    "products_json",
+    "recent_news_json",
+)
+
+
+def _enrichment_assignment(col: str) -> str:
+    # Columns absent from the fields dict keep their value (:set_<col> = 0)
+    if col.endswith("_json"):
+        value = f"CASE WHEN :is_json_{col} THEN json(:{col}) ELSE :{col} END"
+    else:
+        value = f":{col}"
+    return f"{col} = CASE WHEN :set_{col} THEN {value} ELSE {col} END"
+
+
+# One fixed statement for every field combination, so SQLite's statement cache reuses it
+_UPDATE_ENRICHMENT_SQL = (
+    "UPDATE companies SET "
+    + ", ".join(_enrichment_assignment(c) for c in _ENRICHMENT_COLUMNS)
+    + ", last_enriched_at = datetime('now') WHERE id = :id;"
+)
+
+CompanyRow = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], Optional[int]]
 
 
 class CompaniesRepo:
@@ -18,29 +76,54 @@ class CompaniesRepo:
         # Ensure we never insert a NULL name to satisfy stricter schemas
         safe_name = name or domain or "Unknown Company"
         if domain:
-            cur.execute("SELECT id, name, website FROM companies WHERE domain = ?", (domain,))
+            cur.execute(_SELECT_BY_DOMAIN_SQL, (domain,))
             row = cur.fetchone()
             if row:
                 company_id = int(row[0])
                 # Update minimal fields when provided
-                cur.execute(
-                    "UPDATE companies SET name = COALESCE(?, name), website = COALESCE(?, website), source_name = COALESCE(?, source_name), source_query = COALESCE(?, source_query), search_query_id = COALESCE(?, search_query_id) WHERE id = ?",
-                    (safe_name, website, source_name, source_query, search_query_id, company_id),
-                )
+                cur.execute(_UPDATE_BY_ID_SQL, (safe_name, website, source_name, source_query, search_query_id, company_id))
                 self.conn.commit()
                 return company_id
             # Insert new with domain
-            cur.execute(
-                "INSERT INTO companies (name, domain, website, source_name, source_query, search_query_id) VALUES (?, ?, ?, ?, ?, ?)",
-                (safe_name, domain, website, source_name, source_query, search_query_id),
-            )
+            cur.execute(_INSERT_WITH_DOMAIN_SQL, (safe_name, domain, website, source_name, source_query, search_query_id))
             self.conn.commit()
             return int(cur.lastrowid)
         # No domain yet: insert a stub with name only (duplicates allowed)
-        cur.execute("INSERT INTO companies (name, source_name, source_query, search_query_id) VALUES (?, ?, ?, ?)", (safe_name, source_name, source_query, search_query_id))
+        cur.execute(_INSERT_NO_DOMAIN_SQL, (safe_name, source_name, source_query, search_query_id))
         self.conn.commit()
         return int(cur.lastrowid)
 
+    def upsert_many_by_domain(self, rows: Sequence[CompanyRow]) -> List[int]:
+        """Batch variant of upsert_by_domain in a single transaction.
+
+        Rows are (name, domain, website, source_name, source_query, search_query_id);
+        returns company ids aligned with rows.
+        """
+        prepared = [
+            (name or domain or "Unknown Company", domain, website, source_name, source_query, search_query_id)
+            for name, domain, website, source_name, source_query, search_query_id in rows
+        ]
+        with_domain = [r for r in prepared if r[1]]
+        ids: List[int] = []
+        with self.conn:
+            cur = self.conn.cursor()
+            for start in range(0, len(with_domain), _BATCH_SIZE):
+                cur.executemany(_UPSERT_BY_DOMAIN_SQL, with_domain[start:start + _BATCH_SIZE])
+            domain_ids: Dict[str, int] = {}
+            domains = list({r[1] for r in with_domain})
+            for start in range(0, len(domains), _BATCH_SIZE):
+                chunk = domains[start:start + _BATCH_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                cur.execute(f"SELECT id, domain FROM companies WHERE domain IN ({placeholders})", chunk)
+                domain_ids.update((domain, int(cid)) for cid, domain in cur.fetchall())
+            for name, domain, _website, source_name, source_query, search_query_id in prepared:
+                if domain:
+                    ids.append(domain_ids[domain])
+                else:
+                    cur.execute(_INSERT_NO_DOMAIN_SQL, (name, source_name, source_query, search_query_id))
+                    ids.append(int(cur.lastrowid))
+        return ids
+
     def update_enrichment(self, company_id: int, fields: Dict[str, Any]) -> None:
         """Update enrichment-related fields for a company by id.
 
@@ -60,33 +143,19 @@ class CompaniesRepo:
             # Best-effort safeguard; proceed without altering fields on error
             pass
 
-        columns = []
-        values: List[Any] = []
-        for key in [
-            "legal_form",
-            "industries_json",
-            "locations_de_json",
-            "multinational",
-            "domain",
-            "website",
-            "size_employees",
-            "business_model_json",
-            "products_json",
-            "recent_news_json",
-        ]:
-            if key in safe_fields:
-                if key.endswith("_json") and isinstance(safe_fields[key], (list, dict)):
-                    columns.append(f"{key} = json(?)")
-                    import json as _json
-                    # Preserve non-ASCII characters (e.g., umlauts) in stored JSON text
-                    values.append(_json.dumps(safe_fields[key], ensure_ascii=False))
-                else:
-                    columns.append(f"{key} = ?")
-                    values.append(safe_fields[key])
-        columns.append("last_enriched_at = datetime('now')")
-        sql = f"UPDATE companies SET {', '.join(columns)} WHERE id = ?;"
-        values.append(company_id)
-        self.conn.execute(sql, tuple(values))
+        params: Dict[str, Any] = {"id": company_id}
+        for key in _ENRICHMENT_COLUMNS:
+            present = key in safe_fields
+            value = safe_fields.get(key)
+            is_json = key.endswith("_json") and isinstance(value, (list, dict))
+            if is_json:
+                # Preserve non-ASCII characters (e.g., umlauts) in stored JSON text
+                value = json.dumps(value, ensure_ascii=False)
+            params[f"set_{key}"] = 1 if present else 0
+            params[key] = value
+            if key.endswith("_json"):
+                params[f"is_json_{key}"] = 1 if is_json else 0
+        self.conn.execute(_UPDATE_ENRICHMENT_SQL, params)
         self.conn.commit()
 
     def select_pending_enrichment(self, limit: int = 50) -> List[Tuple]:
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Optional, Tuple
+
+
+class LLMCacheRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def get(self, key: str, min_created_at: float) -> Optional[Tuple[str, float]]:
+        """Return (response_json, created_at) for key if stored at or after min_created_at."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT response_json, created_at FROM llm_cache WHERE key = ? AND created_at >= ?",
+            (key, min_created_at),
+        )
+        row = cur.fetchone()
+        return (row[0], float(row[1])) if row else None
+
+    def put(self, key: str, provider: Optional[str], model: Optional[str], response_json: str, created_at: float) -> None:
+        """Insert or replace a cached response."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, provider, model, response_json, created_at) VALUES (?, ?, ?, ?, ?)",
+            (key, provider, model, response_json, created_at),
+        )
+        self.conn.commit()
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+
+class LLMUsageRepo:
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def add_usage_many(self, rows: Iterable[Tuple[str, str, int, int]]) -> None:
+        """Add (run_id, provider, calls, tokens) counts in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                (
+                    "INSERT INTO llm_usage_agg (run_id, provider, calls, tokens) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(run_id, provider) DO UPDATE SET "
+                    "calls = calls + excluded.calls, tokens = tokens + excluded.tokens"
+                ),
+                rows,
+            )
+
+    def usage_for_run(self, run_id: str) -> Dict[str, Dict[str, int]]:
+        """Return { provider: {'calls': N, 'tokens': T} } for the given run_id."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT provider, calls, tokens FROM llm_usage_agg WHERE run_id = ?", (run_id,))
+        return {provider: {"calls": int(calls), "tokens": int(tokens)} for provider, calls, tokens in cur.fetchall()}
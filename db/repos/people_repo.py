@@ -1,7 +1,47 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import Any, Dict, Optional
+from typing import Any, Iterable, Mapping, Optional, Tuple
+
+
+# Column order shared by upsert_person and upsert_many.
+_PERSON_COLUMNS = (
+    "linkedin_profile", "first_name", "last_name", "title_current", "email", "location_text",
+    "connections_linkedin", "followers_linkedin", "website_info", "phone_info", "info_raw",
+    "insights_text", "lookup_date", "source_name", "source_query", "search_query_id",
+)
+
+# Built once at import; upsert_person appends RETURNING, executemany cannot use it.
+_UPSERT_SQL = (
+    "INSERT INTO people (" + ", ".join(_PERSON_COLUMNS) + ") "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, datetime('now')), ?, ?, ?) "
+    "ON CONFLICT(linkedin_profile) DO UPDATE SET "
+    + ", ".join(f"{c} = COALESCE(excluded.{c}, people.{c})" for c in _PERSON_COLUMNS[1:])
+)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _normalize_list_field(value: Any) -> Any:
+    """Lists are stored as '; '-joined text with falsy items dropped; other values pass through."""
+    if isinstance(value, list):
+        if all(isinstance(x, str) for x in value):
+            return '; '.join(filter(None, value))
+        return '; '.join(map(str, filter(None, value)))
+    return value
+
+
+_TRANSFORMS = {"insights_text": _normalize_list_field}
+# Precomputed (column, transform) pairs so the per-row work is a single tuple build.
+_COL_SPECS = tuple((c, _TRANSFORMS.get(c, _identity)) for c in _PERSON_COLUMNS)
+
+
+def _person_to_values(row: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """Row dict -> parameter tuple in _PERSON_COLUMNS order (missing keys are NULL)."""
+    get = row.get
+    return tuple([transform(get(column)) for column, transform in _COL_SPECS])
 
 
 class PeopleRepo:
@@ -28,40 +68,30 @@ class PeopleRepo:
         search_query_id: Optional[int] = None,
     ) -> int:
         """Insert or update a person by linkedin_profile; returns person id."""
-        sql = (
-            "INSERT INTO people (linkedin_profile, first_name, last_name, title_current, email, location_text, connections_linkedin, followers_linkedin, website_info, phone_info, info_raw, insights_text, lookup_date, source_name, source_query, search_query_id) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, datetime('now')), ?, ?, ?) "
-            "ON CONFLICT(linkedin_profile) DO UPDATE SET "
-            " first_name = COALESCE(excluded.first_name, people.first_name), "
-            " last_name = COALESCE(excluded.last_name, people.last_name), "
-            " title_current = COALESCE(excluded.title_current, people.title_current), "
-            " email = COALESCE(excluded.email, people.email), "
-            " location_text = COALESCE(excluded.location_text, people.location_text), "
-            " connections_linkedin = COALESCE(excluded.connections_linkedin, people.connections_linkedin), "
-            " followers_linkedin = COALESCE(excluded.followers_linkedin, people.followers_linkedin), "
-            " website_info = COALESCE(excluded.website_info, people.website_info), "
-            " phone_info = COALESCE(excluded.phone_info, people.phone_info), "
-            " info_raw = COALESCE(excluded.info_raw, people.info_raw), "
-            " insights_text = COALESCE(excluded.insights_text, people.insights_text), "
-            " lookup_date = COALESCE(excluded.lookup_date, people.lookup_date), "
-            " source_name = COALESCE(excluded.source_name, people.source_name), "
-            " source_query = COALESCE(excluded.source_query, people.source_query), "
-            " search_query_id = COALESCE(excluded.search_query_id, people.search_query_id) "
-            "RETURNING id;"
-        )
         cur = self.conn.cursor()
-        cur.execute(sql, (
+        cur.execute(_UPSERT_SQL + " RETURNING id;", (
             linkedin_profile, first_name, last_name, title_current, email, location_text, connections_linkedin, followers_linkedin, website_info, phone_info, info_raw, insights_text, lookup_date, source_name, source_query, search_query_id
         ))
         row = cur.fetchone()
         return int(row[0])
 
+    def upsert_many(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Upsert many people (dicts keyed like upsert_person's kwargs) in one transaction."""
+        with self.conn:
+            cur = self.conn.executemany(_UPSERT_SQL, (_person_to_values(row) for row in rows))
+        return cur.rowcount
+
     def link_person_to_company(self, linkedin_profile: str, company_id: int) -> None:
         """Associate a person row to a company by ids."""
         sql = "UPDATE people SET company_id = ? WHERE linkedin_profile = ?;"
         self.conn.execute(sql, (company_id, linkedin_profile))
         self.conn.commit()
 
+    def link_many(self, links: Iterable[Tuple[int, str]]) -> None:
+        """Set company_id for many people given (company_id, linkedin_profile) pairs, in one transaction."""
+        with self.conn:
+            self.conn.executemany("UPDATE people SET company_id = ? WHERE linkedin_profile = ?;", links)
+
     # --- Normalized names (wrappers) ---
     def upsert(self, **kwargs) -> int:
         """Normalized wrapper alias for upserting a person."""
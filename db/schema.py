@@ -3,9 +3,58 @@ from __future__ import annotations
 import sqlite3
 
 
+# Bump whenever bootstrap() gains DDL so existing databases pick it up once.
+SCHEMA_VERSION = 2
+
+# Columns added after the first release: (name, declaration)
+_PEOPLE_BACKFILL_COLUMNS = (
+    ("connections_linkedin", "INTEGER"),
+    ("followers_linkedin", "INTEGER"),
+    ("website_info", "TEXT"),
+    ("phone_info", "TEXT"),
+    ("info_raw", "TEXT"),
+    ("insights_text", "TEXT"),
+    ("lookup_date", "TEXT"),
+    ("is_hot", "INTEGER NOT NULL DEFAULT 0"),
+    ("status", "TEXT"),
+    ("notes", "TEXT"),
+    ("last_interaction_date", "TEXT"),
+    ("source_name", "TEXT"),
+    ("source_query", "TEXT"),
+    ("search_query_id", "INTEGER"),
+)
+_COMPANIES_BACKFILL_COLUMNS = (
+    ("search_query_id", "INTEGER"),
+    ("source_name", "TEXT"),
+    ("source_query", "TEXT"),
+)
+
+
+def _schema_is_current(cur: sqlite3.Cursor) -> bool:
+    try:
+        row = cur.execute("SELECT version FROM schema_version WHERE id = 1;").fetchone()
+    except sqlite3.OperationalError:
+        # Fresh database: schema_version does not exist yet
+        return False
+    return bool(row) and int(row[0]) >= SCHEMA_VERSION
+
+
+def _add_missing_columns(cur: sqlite3.Cursor, table: str, columns) -> None:
+    existing = {row[1] for row in cur.execute(f"PRAGMA table_info({table});")}
+    for name, decl in columns:
+        if name not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl};")
+
+
 def bootstrap(conn: sqlite3.Connection) -> None:
-    """Create normalized schema, indexes, and views (idempotent)."""
+    """Create normalized schema, indexes, and views (idempotent).
+
+    Returns immediately when schema_version already records SCHEMA_VERSION.
+    Connection pragmas are set by db.connection.get_connection.
+    """
     cur = conn.cursor()
+    if _schema_is_current(cur):
+        return
 
     # Schema versioning (lightweight)
     cur.execute(
@@ -74,78 +123,9 @@ def bootstrap(conn: sqlite3.Connection) -> None:
             ")"
         )
     )
-    # Backfill columns if table existed before
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN connections_linkedin INTEGER;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN followers_linkedin INTEGER;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN website_info TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN phone_info TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN info_raw TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN insights_text TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN lookup_date TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN is_hot INTEGER NOT NULL DEFAULT 0;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN status TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN notes TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN last_interaction_date TEXT;")
-    except Exception:
-        pass
-    # Backfill provenance columns for people
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN source_name TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN source_query TEXT;")
-    except Exception:
-        pass
-    # Backfill query linkage columns if table existed before
-    try:
-        cur.execute("ALTER TABLE people ADD COLUMN search_query_id INTEGER;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE companies ADD COLUMN search_query_id INTEGER;")
-    except Exception:
-        pass
-    # Backfill provenance columns for companies
-    try:
-        cur.execute("ALTER TABLE companies ADD COLUMN source_name TEXT;")
-    except Exception:
-        pass
-    try:
-        cur.execute("ALTER TABLE companies ADD COLUMN source_query TEXT;")
-    except Exception:
-        pass
+    # Backfill columns if tables existed before
+    _add_missing_columns(cur, "people", _PEOPLE_BACKFILL_COLUMNS)
+    _add_missing_columns(cur, "companies", _COMPANIES_BACKFILL_COLUMNS)
     cur.execute("CREATE INDEX IF NOT EXISTS idx_people_company_id ON people(company_id);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_people_last_first ON people(last_name, first_name);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_people_search_query_id ON people(search_query_id);")
@@ -205,6 +185,32 @@ def bootstrap(conn: sqlite3.Connection) -> None:
     cur.execute("CREATE INDEX IF NOT EXISTS idx_outreach_messages_scheduled ON outreach_messages(scheduled_at);")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_outreach_messages_channel ON outreach_messages(channel);")
 
+    # LLM response cache (keyed by sha256 of provider|model|use_case|prompt)
+    cur.execute(
+        (
+            "CREATE TABLE IF NOT EXISTS llm_cache (\n"
+            "  key TEXT PRIMARY KEY,\n"
+            "  provider TEXT,\n"
+            "  model TEXT,\n"
+            "  response_json TEXT NOT NULL,\n"
+            "  created_at REAL NOT NULL\n"
+            ")"
+        )
+    )
+
+    # Per-run LLM usage aggregate (maintained by utils.llm_logger.log_call)
+    cur.execute(
+        (
+            "CREATE TABLE IF NOT EXISTS llm_usage_agg (\n"
+            "  run_id TEXT NOT NULL,\n"
+            "  provider TEXT NOT NULL,\n"
+            "  calls INTEGER NOT NULL DEFAULT 0,\n"
+            "  tokens INTEGER NOT NULL DEFAULT 0,\n"
+            "  PRIMARY KEY (run_id, provider)\n"
+            ")"
+        )
+    )
+
     # View for joined reads
     cur.execute("DROP VIEW IF EXISTS v_people_with_company;")
     cur.execute(
@@ -270,11 +276,7 @@ def bootstrap(conn: sqlite3.Connection) -> None:
         # Best effort backfill; ignore in bootstrap failures
         pass
 
-    # Bump schema version if needed (example: still at version 1)
-    try:
-        cur.execute("UPDATE schema_version SET version = 1 WHERE id = 1;")
-    except Exception:
-        pass
+    cur.execute("UPDATE schema_version SET version = ? WHERE id = 1;", (SCHEMA_VERSION,))
 
     conn.commit()
 
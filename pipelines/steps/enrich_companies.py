@@ -114,10 +114,12 @@ class LoadPendingCompanies:
 
 
 class EnrichAndPersistCompanies:
-    def __init__(self, conn: sqlite3.Connection, fetch_func: Callable[[Optional[str], Optional[str]], Optional[Dict[str, Any]]], on_progress: Optional[Callable[[int, int, int, str], None]] = None) -> None:
+    def __init__(self, conn: sqlite3.Connection, fetch_func: Callable[[Optional[str], Optional[str]], Optional[Dict[str, Any]]], on_progress: Optional[Callable[[int, int, int, str], None]] = None, batch_fetch_func: Optional[Callable[[List[Tuple[Optional[str], Optional[str]]]], List[Optional[Dict[str, Any]]]]] = None) -> None:
         self.conn = conn
         self.fetch_func = fetch_func
         self.on_progress = on_progress
+        # Optional: fetch all companies in one call (e.g., async provider batch); preferred over fetch_func
+        self.batch_fetch_func = batch_fetch_func
 
     def run(self, ctx: RunContext) -> RunContext:
         import concurrent.futures as _fut
@@ -142,17 +144,31 @@ class EnrichAndPersistCompanies:
                 return cid, name, domain, None
 
         results = []
-        try:
-            max_workers = max(1, ctx.meta.get("enrich_concurrency") or 4)
-        except Exception:
-            max_workers = 4
-        with _fut.ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futures = [ex.submit(_fetch, c) for c in companies]
-            for idx, fut in enumerate(_fut.as_completed(futures), start=1):
-                try:
-                    results.append(fut.result())
-                except Exception:
-                    continue
+        if self.batch_fetch_func is not None:
+            if self.on_progress:
+                for comp in companies:
+                    try:
+                        self.on_progress(-1, total, int(comp.get("id")), str(comp.get("name") or ""))
+                    except Exception:
+                        pass
+            try:
+                fetched = self.batch_fetch_func([(c.get("name"), c.get("domain")) for c in companies])
+            except Exception:
+                fetched = [None] * total
+            for comp, data in zip(companies, fetched):
+                results.append((comp.get("id"), comp.get("name"), comp.get("domain"), data))
+        else:
+            try:
+                max_workers = max(1, ctx.meta.get("enrich_concurrency") or 4)
+            except Exception:
+                max_workers = 4
+            with _fut.ThreadPoolExecutor(max_workers=max_workers) as ex:
+                futures = [ex.submit(_fetch, c) for c in companies]
+                for idx, fut in enumerate(_fut.as_completed(futures), start=1):
+                    try:
+                        results.append(fut.result())
+                    except Exception:
+                        continue
 
         # Fail fast if any enrichment returned no usable data
         missing = [(cid, nm) for (cid, nm, _dm, data) in results if not isinstance(data, dict)]
@@ -8,6 +8,7 @@ import logging
 import json
 import html
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 from config.settings import get_settings
@@ -17,14 +18,21 @@ try:
 except ImportError:
     AI_AVAILABLE = False
 
-from utils.llm_logger import log_call, sha256_text  # added
+from utils import llm_logger
+from utils.llm_logger import sha256_text  # added
+
+
+@lru_cache(maxsize=4)
+def _shared_openai_client(api_key: str) -> "openai.OpenAI":
+    """One OpenAI client per API key; the client is thread-safe, extractors are per run."""
+    return openai.OpenAI(api_key=api_key)
 
 
 class AIProfileExtractor:
     """Uses OpenAI to extract structured data from LinkedIn profiles."""
 
     def __init__(self, api_key: str, model: str = None):
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = _shared_openai_client(api_key)
         from config.settings import get_settings  # late import to avoid cycles
         settings = get_settings()
         # Per-operation model selection (cost-efficient defaults)
@@ -101,7 +109,7 @@ class AIProfileExtractor:
 
             # log call (non-blocking best-effort)
             try:
-                log_call(
+                llm_logger.log_call(
                     caller="AIProfileExtractor.extract_structured_data",
                     provider="openai",
                     model=self.model_chat,
@@ -132,7 +140,7 @@ class AIProfileExtractor:
         except json.JSONDecodeError as e:
             logging.warning(f"Failed to parse AI response JSON for {profile_name}: {e}")
             try:
-                log_call(
+                llm_logger.log_call(
                     caller="AIProfileExtractor.extract_structured_data",
                     provider="openai",
                     model=self.model_chat,
@@ -147,7 +155,7 @@ class AIProfileExtractor:
         except Exception as e:
             logging.error(f"AI extraction failed for {profile_name}: {e}")
             try:
-                log_call(
+                llm_logger.log_call(
                     caller="AIProfileExtractor.extract_structured_data",
                     provider="openai",
                     model=self.model_chat,
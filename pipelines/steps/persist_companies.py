@@ -14,7 +14,7 @@ class PersistCompanies:
     def run(self, ctx: RunContext) -> RunContext:
         companies: List[Dict] = ctx.companies or []
         repo = CompaniesRepo(self.conn)
-        processed = 0
+        rows = []
         for c in companies:
             try:
                 name = c.get("Company") or c.get("name")
@@ -24,11 +24,22 @@ class PersistCompanies:
                 source_query = c.get("source_query") or None
                 if not (name or domain or website):
                     continue
-                repo.upsert_by_domain(name, domain, website, source_name=source_name, source_query=source_query)
-                processed += 1
+                rows.append((name, domain, website, source_name, source_query, None))
             except Exception:
                 # Best-effort persistence; skip faulty entries
                 pass
+        try:
+            repo.upsert_many_by_domain(rows)
+            processed = len(rows)
+        except Exception:
+            # Batch failed (rolled back): fall back to per-row so one bad row does not sink the rest
+            processed = 0
+            for row in rows:
+                try:
+                    repo.upsert_by_domain(*row)
+                    processed += 1
+                except Exception:
+                    pass
         ctx.meta["processed_companies"] = processed
         return ctx
 
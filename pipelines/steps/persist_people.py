@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from db.repos.people_repo import PeopleRepo
 from db.repos.companies_repo import CompaniesRepo
@@ -11,6 +11,30 @@ from pipelines.runner import RunContext
 import re
 
 
+# Common degree prefixes in Germany (expandable). Alternatives are tried in
+# order, so longer prefixes (Prof. Dr.) must precede their shorter forms.
+_DEGREE_PREFIX_RE = re.compile(
+    r"^(?:"
+    r"prof\.?\s+dr\.?"      # Prof. Dr.
+    r"|dr\.-ing\.?"          # Dr.-Ing.
+    r"|dipl\.-ing\.?"        # Dipl.-Ing.
+    r"|priv\.-doz\.?"        # Priv.-Doz.
+    r"|prof\.?"              # Prof.
+    r"|pd\.?"                # PD.
+    r"|dr\.?"                # Dr.
+    r"|mag\.?"               # Mag.
+    r"|ing\.?"               # Ing.
+    r"|mba"                  # MBA
+    r"|m\.sc\.?"             # M.Sc.
+    r"|b\.sc\.?"             # B.Sc.
+    r")\s+",
+    re.IGNORECASE,
+)
+
+# People written per transaction; progress is reported after each chunk
+_CHUNK_SIZE = 200
+
+
 class PersistPeople:
     def __init__(self, conn: sqlite3.Connection, on_processed: Optional[Callable[[int], None]] = None) -> None:
         self.conn = conn
@@ -28,34 +52,14 @@ class PersistPeople:
         text = (full_name or "").strip()
         if not text:
             return None, ""
-        # Common degree prefixes in Germany (expandable). Ordered for longest-first matching.
-        patterns = [
-            r"^prof\.?\s+dr\.?\s+",           # Prof. Dr. 
-            r"^dr\.-ing\.?\s+",               # Dr.-Ing.
-            r"^dipl\.-ing\.?\s+",             # Dipl.-Ing.
-            r"^priv\.-doz\.?\s+",             # Priv.-Doz.
-            r"^prof\.?\s+",                    # Prof.
-            r"^pd\.?\s+",                      # PD.
-            r"^dr\.?\s+",                      # Dr.
-            r"^mag\.?\s+",                     # Mag.
-            r"^ing\.?\s+",                     # Ing.
-            r"^mba\s+",                         # MBA
-            r"^m\.sc\.?\s+",                  # M.Sc.
-            r"^b\.sc\.?\s+",                  # B.Sc.
-        ]
-        for pat in patterns:
-            m = re.match(pat, text, flags=re.IGNORECASE)
-            if m:
-                deg = text[:m.end()].strip()
-                # Normalize spacing/casing of degree as it appeared
-                cleaned = text[m.end():].strip()
-                # Ensure standard dot casing e.g., Dr. vs dr.
-                degree_norm = deg.strip()
-                return degree_norm, cleaned
+        m = _DEGREE_PREFIX_RE.match(text)
+        if m:
+            return text[:m.end()].strip(), text[m.end():].strip()
         return None, text
 
     def run(self, ctx: RunContext) -> RunContext:
-        processed = 0
+        # (person row, company row or None) per profile, in input order
+        entries: List[Tuple[Dict[str, Any], Optional[tuple]]] = []
         # Resolve canonical query id once per run (if provided in records)
         canonical_query_id = None
         try:
@@ -114,7 +118,7 @@ class PersistPeople:
             info_raw = p.get('Info_raw') or p.get('summary')
             insights_val = p.get('Insights') or p.get('summary_other')
             if isinstance(insights_val, list):
-                insights_text = '; '.join([str(x) for x in insights_val if x])
+                insights_text = '; '.join(map(str, filter(None, insights_val)))
             elif isinstance(insights_val, str):
                 insights_text = insights_val
             else:
@@ -124,36 +128,46 @@ class PersistPeople:
             source_name = p.get('source_name') or None
             source_query = p.get('source_query') or None
 
-            person_id = self.people_repo.upsert(
-                linkedin_profile=profile_url,
-                first_name=first,
-                last_name=last,
-                title_current=title,
-                email=email,
-                location_text=location,
-                connections_linkedin=connections_val,
-                followers_linkedin=followers_val,
-                website_info=website_info,
-                phone_info=phone_info,
-                info_raw=info_raw,
-                insights_text=insights_text,
-                lookup_date=lookup_date,
-                source_name=source_name,
-                source_query=source_query,
-                search_query_id=canonical_query_id,
-            )
+            person_row = {
+                "linkedin_profile": profile_url,
+                "first_name": first,
+                "last_name": last,
+                "title_current": title,
+                "email": email,
+                "location_text": location,
+                "connections_linkedin": connections_val,
+                "followers_linkedin": followers_val,
+                "website_info": website_info,
+                "phone_info": phone_info,
+                "info_raw": info_raw,
+                "insights_text": insights_text,
+                "lookup_date": lookup_date,
+                "source_name": source_name,
+                "source_query": source_query,
+                "search_query_id": canonical_query_id,
+            }
 
             company_name = p.get('Company') or p.get('company')
             website = p.get('Company_Website') or p.get('company_website') or p.get('Website_Info') or p.get('website')
             domain = p.get('Company_Domain') or extract_apex_domain(website)
-            company_id = None
+            company_row = None
             if domain or company_name:
-                company_id = self.companies_repo.upsert_company(company_name, domain, website, source_name=source_name, source_query=source_query, search_query_id=canonical_query_id)
-
-            if company_id:
-                self.people_repo.link_person_to_company(profile_url, company_id)
+                company_row = (company_name, domain, website, source_name, source_query, canonical_query_id)
+            entries.append((person_row, company_row))
 
-            processed += 1
+        processed = 0
+        for start in range(0, len(entries), _CHUNK_SIZE):
+            chunk = entries[start:start + _CHUNK_SIZE]
+            try:
+                processed += self._write_chunk(chunk)
+            except Exception:
+                # Batch failed (rolled back): fall back to per-person so one bad row does not sink the rest
+                for entry in chunk:
+                    try:
+                        self._write_one(*entry)
+                        processed += 1
+                    except Exception:
+                        pass
             if self.on_processed:
                 try:
                     self.on_processed(processed)
@@ -163,4 +177,22 @@ class PersistPeople:
         ctx.meta['processed_people'] = processed
         return ctx
 
-
+    def _write_chunk(self, chunk: List[Tuple[Dict[str, Any], Optional[tuple]]]) -> int:
+        """Batched writes: people, then their companies, then the links (one transaction each)."""
+        self.people_repo.upsert_many([person for person, _ in chunk])
+        linked = [(person["linkedin_profile"], company) for person, company in chunk if company]
+        company_ids = self.companies_repo.upsert_many_by_domain([company for _, company in linked])
+        self.people_repo.link_many(
+            (company_id, profile_url) for company_id, (profile_url, _) in zip(company_ids, linked) if company_id
+        )
+        return len(chunk)
+
+    def _write_one(self, person: Dict[str, Any], company: Optional[tuple]) -> None:
+        """Per-person fallback: person, company and link commit or roll back together."""
+        with self.conn:
+            self.people_repo.upsert(**person)
+            if company:
+                company_name, domain, website, source_name, source_query, search_query_id = company
+                company_id = self.companies_repo.upsert_company(company_name, domain, website, source_name=source_name, source_query=source_query, search_query_id=search_query_id)
+                if company_id:
+                    self.people_repo.link_person_to_company(person["linkedin_profile"], company_id)
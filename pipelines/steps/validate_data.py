@@ -252,17 +252,15 @@ class DataValidator:
         return cleaned
 
     def remove_company_duplicates(self, companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        seen = set()
-        unique: List[Dict[str, Any]] = []
+        # First occurrence per key wins; dicts keep insertion order
+        seen: Dict[str, Dict[str, Any]] = {}
         for c in companies:
             key = (c.get('Company_Domain') or c.get('domain') or '').lower()
             if not key:
                 # Fallback: name+address signature when domain missing
                 key = ((c.get('Company') or c.get('name') or '').strip().lower() + '|' + (c.get('address') or '').strip().lower())
-            if key and key not in seen:
-                seen.add(key)
-                unique.append(c)
-        return unique
+            seen.setdefault(key, c)
+        return list(seen.values())
 
     def validate_all_companies(self, companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         valid: List[Dict[str, Any]] = []
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Protocol, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, Tuple
 
 
 class PeopleRepoPort(Protocol):
@@ -24,9 +24,15 @@ class PeopleRepoPort(Protocol):
     ) -> int:
         ...
 
+    def upsert_many(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        ...
+
     def link_person_to_company(self, linkedin_profile: str, company_id: int) -> None:
         ...
 
+    def link_many(self, links: Iterable[Tuple[int, str]]) -> None:
+        ...
+
 
 class CompaniesRepoPort(Protocol):
     def upsert_by_domain(
@@ -39,6 +45,9 @@ class CompaniesRepoPort(Protocol):
     ) -> int:
         ...
 
+    def upsert_many_by_domain(self, rows: Sequence[Tuple]) -> List[int]:
+        ...
+
     def update_enrichment(self, company_id: int, fields: Dict[str, Any]) -> None:
         ...
 
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import re
 from typing import Optional
+from urllib.parse import urlparse, unquote
 import unicodedata
 
+# Already-canonical profile URLs (lowercase ASCII slug, nothing after it)
+_CANONICAL_PROFILE_RE = re.compile(r"https://linkedin\.com/in/[a-z0-9._~-]+")
+
 
 def extract_apex_domain(url_or_domain: Optional[str]) -> Optional[str]:
     if not url_or_domain:
@@ -23,8 +28,9 @@ def extract_apex_domain(url_or_domain: Optional[str]) -> Optional[str]:
 def normalize_linkedin_profile_url(url: Optional[str]) -> Optional[str]:
     if not url:
         return None
+    if _CANONICAL_PROFILE_RE.fullmatch(url):
+        return url
     try:
-        from urllib.parse import urlparse, unquote
         u = urlparse(url)
         host = (u.netloc or '').lower().replace('www.', '').replace('de.linkedin.com', 'linkedin.com')
         path = (u.path or '').rstrip('/')
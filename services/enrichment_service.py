@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import re
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
@@ -12,11 +14,13 @@ from functools import lru_cache
 from services.domain_utils import extract_apex_domain
 """All env loading is centralized in config.settings; no direct dotenv here."""
 
-from utils.llm_logger import log_call, sha256_text  # added
+from utils.llm_logger import sha256_text  # added
 
 
 PROMPT_PATH = Path(__file__).resolve().parent.parent / "prompts" / "enrichment_prompt.txt"
 
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\n([\s\S]*?)\n```")
+
 
 def _load_prompt_template() -> str:
     try:
@@ -33,6 +37,13 @@ def _load_prompt_template() -> str:
 def _extract_json(text: str) -> Optional[Dict[str, Any]]:
     if not text:
         return None
+    # Fast path: a bare JSON object cannot be fenced and its brace slice is itself
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            return json.loads(stripped)
+        except Exception:
+            return None
     # Try raw parse first
     try:
         return json.loads(text)
@@ -40,8 +51,7 @@ def _extract_json(text: str) -> Optional[Dict[str, Any]]:
         pass
     # Try fenced blocks
     try:
-        import re
-        m = re.search(r"```(?:json)?\n([\s\S]*?)\n```", text)
+        m = _JSON_FENCE_RE.search(text)
         if m:
             return json.loads(m.group(1))
     except Exception:
@@ -111,14 +121,8 @@ def _fetch_page_text(url: str, max_chars: int = 4000) -> Optional[str]:
         return None
 
 
-def fetch_company_enrichment(company_name: str, domain: Optional[str]) -> Optional[Dict[str, Any]]:
-    """Fetch enrichment via centralized LLMClient gateway (multi-provider)."""
-    try:
-        from services.llm_client import LLMClient
-        from config.llm_routes import ROUTES
-    except Exception:
-        return None
-
+def _build_enrichment_request(company_name: str, domain: Optional[str]) -> Dict[str, Any]:
+    """Resolve homepage/context and build the keyword arguments for LLMClient.enrich_company."""
     prompt = _load_prompt_template()
     homepage_url = None
     apex = domain
@@ -134,15 +138,51 @@ def fetch_company_enrichment(company_name: str, domain: Optional[str]) -> Option
         context = f"\nWebsite URL: {homepage_url}\nWebsite excerpt (truncated):\n{page_text}\n"
     user_msg = f"{prompt}\n\n{target}{context}"
 
-    llm = LLMClient()
-    data = llm.enrich_company(
-        company_name=company_name,
-        domain=apex or domain,
-        user_message=user_msg,
-        prompt_name=str(PROMPT_PATH.name),
-        prompt_text=prompt,
-    )
-    return data
+    return {
+        "company_name": company_name,
+        "domain": apex or domain,
+        "user_message": user_msg,
+        "prompt_name": str(PROMPT_PATH.name),
+        "prompt_text": prompt,
+    }
+
+
+def fetch_company_enrichment(company_name: str, domain: Optional[str], db_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Fetch enrichment via centralized LLMClient gateway (multi-provider).
+
+    db_path selects the DB holding the response cache (default: settings.db_path).
+    """
+    try:
+        from services.llm_client import LLMClient
+        from config.llm_routes import ROUTES
+    except Exception:
+        return None
+
+    request = _build_enrichment_request(company_name, domain)
+    with LLMClient(db_path=db_path) as llm:
+        return llm.enrich_company(**request)
+
+
+def fetch_company_enrichment_batch(companies: List[Tuple[Optional[str], Optional[str]]], db_path: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """Fetch enrichment for many (name, domain) pairs concurrently.
+
+    Homepage lookups run in worker threads, provider calls go through
+    LLMClient.abatch_enrich. Results keep the input order; failures are None.
+    db_path selects the DB holding the response cache (default: settings.db_path).
+    """
+    try:
+        from services.llm_client import LLMClient
+    except Exception:
+        return [None] * len(companies)
+
+    async def _run() -> List[Optional[Dict[str, Any]]]:
+        prepared = await asyncio.gather(
+            *[asyncio.to_thread(_build_enrichment_request, name, domain) for name, domain in companies]
+        )
+        with LLMClient(db_path=db_path) as llm:
+            return await llm.abatch_enrich(list(prepared))
+
+    return asyncio.run(_run())
 
 
 def fetch_company_enrichment_linkup(company_name: str, domain: Optional[str]) -> Optional[Dict[str, Any]]:
@@ -189,13 +229,13 @@ def fetch_company_enrichment_linkup(company_name: str, domain: Optional[str]) ->
         )
         # Linkup client may already return a dict that matches the model; ensure dict
         if hasattr(resp, "model_dump"):
-            return resp.model_dump()
+            return resp.model_dump(by_alias=True, exclude_none=True)
         if isinstance(resp, dict):
             return resp
         # Fallback: try to coerce through pydantic
         try:
             parsed = CompanyResearch.model_validate(resp)
-            return parsed.model_dump()
+            return parsed.model_dump(by_alias=True, exclude_none=True)
         except Exception:
             return None
     except Exception:
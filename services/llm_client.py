@@ -1,124 +1,361 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import atexit
+import json
+import re
+import sqlite3
+import threading
+import time
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from config.settings import get_settings
 from config.llm_routes import ROUTES
-from utils.llm_logger import log_call, sha256_text
+from utils import llm_logger
+from utils.llm_logger import sha256_text
+
+try:
+    # Unified app schema for enrichment structured output
+    from models import EnrichmentResult as CompanyResearch
+except ImportError:  # pydantic missing
+    CompanyResearch = None  # type: ignore[assignment,misc]
+
+try:
+    import httpx  # type: ignore
+except ImportError:  # only pulled in by the OpenAI SDK
+    httpx = None  # type: ignore[assignment]
+
+
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\n([\s\S]*?)\n```")
+
+# Hot in-process layer over the SQLite response cache: key -> (created_at, result)
+_HOT_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_HOT_CACHE_MAX = 1024
+
+
+def _remember_hot(key: str, created_at: float, result: Dict[str, Any]) -> None:
+    if key not in _HOT_CACHE and len(_HOT_CACHE) >= _HOT_CACHE_MAX:
+        # Evict the oldest entry (dicts keep insertion order)
+        _HOT_CACHE.pop(next(iter(_HOT_CACHE)), None)
+    _HOT_CACHE[key] = (created_at, result)
+
+
+# One keep-alive HTTP pool shared by every sync OpenAI client in the process
+_SHARED_HTTPX: Any = None
+_SHARED_HTTPX_LOCK = threading.Lock()
+
+
+def _shared_httpx() -> Any:
+    global _SHARED_HTTPX
+    if httpx is None:
+        return None
+    with _SHARED_HTTPX_LOCK:
+        if _SHARED_HTTPX is None:
+            _SHARED_HTTPX = httpx.Client(
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                timeout=httpx.Timeout(60.0),
+            )
+            atexit.register(_SHARED_HTTPX.close)
+    return _SHARED_HTTPX
+
+
+def _openai_client(api_key: Optional[str]) -> Any:
+    from openai import OpenAI
+    http_client = _shared_httpx()
+    if http_client is None:
+        return OpenAI(api_key=api_key)
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+def _extract_json(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not text:
+        return None
+    # Fast path: a bare JSON object cannot be fenced and its brace slice is itself
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        try:
+            return json.loads(stripped)
+        except Exception:
+            return None
+    # Try raw parse first
+    try:
+        return json.loads(text)
+    except Exception:
+        pass
+    # Try fenced code block
+    try:
+        m = _JSON_FENCE_RE.search(text)
+        if m:
+            return json.loads(m.group(1))
+    except Exception:
+        pass
+    # Try curly braces slice
+    try:
+        start = text.find("{")
+        end = text.rfind("}")
+        if start != -1 and end != -1 and end > start:
+            return json.loads(text[start : end + 1])
+    except Exception:
+        pass
+    return None
+
+
+def _usage_from_response(resp: Any) -> Optional[Dict[str, Any]]:
+    try:
+        usage = getattr(resp, "usage", None)
+        if usage:
+            return {
+                "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                "completion_tokens": getattr(usage, "completion_tokens", None),
+                "total_tokens": getattr(usage, "total_tokens", None),
+            }
+    except Exception:
+        pass
+    return None
+
+
+def _linkup_result_to_dict(resp: Any, schema: Any) -> Optional[Dict[str, Any]]:
+    # Alias keys (Legal_Form, ...) are what consumers read; None fields are
+    # skipped since callers use .get() anyway. Defaults are kept: [] != None downstream.
+    if hasattr(resp, "model_dump"):
+        return resp.model_dump(by_alias=True, exclude_none=True)
+    if isinstance(resp, dict):
+        return resp
+    try:
+        parsed = schema.model_validate(resp)
+        return parsed.model_dump(by_alias=True, exclude_none=True)
+    except Exception:
+        return None
 
 
 class LLMClient:
     """Minimal wrapper to centralize per-use-case routing and logging."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_conn: Optional[sqlite3.Connection] = None, db_path: Optional[str] = None) -> None:
         self.settings = get_settings()
+        # SDK clients are built on first use (cached_property) and reused across calls
+        self._cache: Any = None
+        # Response cache connection: injected (caller closes it) or opened lazily on
+        # db_path (close() closes it). The async methods reach it from worker
+        # threads, so an injected connection needs check_same_thread=False there.
+        self._cache_conn = cache_conn
+        self._owns_cache_conn = cache_conn is None
+        self._cache_db_path = db_path or self.settings.db_path
+        self._cache_lock = threading.Lock()
 
-    def chat(self, *, use_case: str, messages: List[Dict[str, str]], temperature: Optional[float] = None, prompt_name: Optional[str] = None, prompt_text: Optional[str] = None) -> Any:
-        route = ROUTES.get(use_case, {})
-        provider = route.get("provider", "openai")
-        model = route.get("model") or self.settings.openai_model or "gpt-4o-mini"
-        op = route.get("operation", "chat")
-        temp = temperature if temperature is not None else route.get("temperature")
+    def __enter__(self) -> "LLMClient":
+        return self
 
-        if provider != "openai":
-            raise NotImplementedError(f"Provider not implemented: {provider}")
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
-        from openai import OpenAI
-        client = OpenAI(api_key=self.settings.openai_api_key)
+    def close(self) -> None:
+        """Close the response-cache connection if this client opened it."""
+        with self._cache_lock:
+            conn, self._cache_conn, self._cache = self._cache_conn, None, None
+            if conn is not None and self._owns_cache_conn:
+                conn.close()
 
-        import time as _time
-        _t0 = _time.time()
-        kwargs: Dict[str, Any] = {"model": model, "messages": messages}
-        # Only pass temperature if explicitly provided (some models only accept default)
-        if temp is not None:
-            kwargs["temperature"] = temp
-        resp = client.chat.completions.create(**kwargs)
-        _dt_ms = int((_time.time() - _t0) * 1000)
+    @cached_property
+    def _openai(self) -> Any:
+        if not self.settings.openai_api_key:
+            return None
+        try:
+            return _openai_client(self.settings.openai_api_key)
+        except Exception:
+            return None
+
+    @cached_property
+    def _async_openai(self) -> Any:
+        if not self.settings.openai_api_key:
+            return None
+        try:
+            from openai import AsyncOpenAI
+            return AsyncOpenAI(api_key=self.settings.openai_api_key)
+        except Exception:
+            return None
 
-        usage_obj = None
+    @cached_property
+    def _linkup_sdk(self) -> Tuple[Any, Optional[str]]:
+        """(LinkupClient or None, import/construction error or None)."""
         try:
-            usage = getattr(resp, "usage", None)
-            if usage:
-                usage_obj = {
-                    "prompt_tokens": getattr(usage, "prompt_tokens", None),
-                    "completion_tokens": getattr(usage, "completion_tokens", None),
-                    "total_tokens": getattr(usage, "total_tokens", None),
-                }
+            from linkup import LinkupClient  # type: ignore
+            if self.settings.linkup_api_key:
+                return LinkupClient(api_key=self.settings.linkup_api_key), None
+            return None, None
+        except Exception as e:
+            return None, str(e)
+
+    @property
+    def _linkup(self) -> Any:
+        return self._linkup_sdk[0]
+
+    @property
+    def _linkup_import_error(self) -> Optional[str]:
+        return self._linkup_sdk[1]
+
+    def _cache_repo(self) -> Any:
+        if self._cache is None:
+            from db.repos.llm_cache_repo import LLMCacheRepo
+            if self._cache_conn is None:
+                from db import schema
+                from db.connection import get_connection
+                self._cache_conn = get_connection(self._cache_db_path, check_same_thread=False)
+                self._owns_cache_conn = True
+                schema.bootstrap(self._cache_conn)
+            self._cache = LLMCacheRepo(self._cache_conn)
+        return self._cache
+
+    def _cache_get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return a cached response for key if caching is enabled and the entry is fresh."""
+        if not self.settings.llm_cache_enabled or not key:
+            return None
+        min_created_at = time.time() - self.settings.llm_cache_ttl_seconds
+        hot = _HOT_CACHE.get(key)
+        if hot and hot[0] >= min_created_at:
+            return dict(hot[1])
+        try:
+            with self._cache_lock:
+                row = self._cache_repo().get(key, min_created_at)
+            if row is None:
+                return None
+            result = json.loads(row[0])
+        except Exception:
+            return None
+        if not isinstance(result, dict):
+            return None
+        _remember_hot(key, row[1], result)
+        return dict(result)
+
+    def _cache_put(self, key: Optional[str], provider: str, model: Optional[str], result: Optional[Dict[str, Any]]) -> None:
+        if not self.settings.llm_cache_enabled or not key or not isinstance(result, dict):
+            return
+        created_at = time.time()
+        try:
+            response_json = json.dumps(result, ensure_ascii=False)
+            with self._cache_lock:
+                self._cache_repo().put(key, provider, model, response_json, created_at)
         except Exception:
-            usage_obj = None
+            return
+        _remember_hot(key, created_at, dict(result))
+
+    def _enrichment_cache_keys(self, provider: str, model: str, domain: Optional[str], user_message: str, prompt_text: Optional[str] = None) -> List[str]:
+        """Cache keys for an enrichment request, most specific first.
+
+        The exact-prompt key only matches byte-identical prompts; the company key
+        (provider, model, prompt template, apex domain) also matches changed
+        website excerpts for the same company, but not an edited template.
+        """
+        keys = [sha256_text(f"{provider}|{model}|company_enrichment|{user_message}")]
+        apex = (domain or "").strip().lower()
+        if apex:
+            template = sha256_text(prompt_text) or ""
+            keys.append(sha256_text(f"{provider}|{model}|company_enrichment|{template}|domain:{apex}"))
+        return [k for k in keys if k]
+
+    def _cached_enrichment(self, keys: List[str]) -> Optional[Dict[str, Any]]:
+        for key in keys:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+        return None
+
+    def _store_enrichment(self, keys: List[str], provider: str, model: Optional[str], result: Optional[Dict[str, Any]]) -> None:
+        for key in keys:
+            self._cache_put(key, provider, model, result)
+
+    def _chat_route(self, use_case: str, temperature: Optional[float]) -> Tuple[str, str, str, Optional[float]]:
+        route = ROUTES.get(use_case, {})
+        provider = route.get("provider", "openai")
+        model = route.get("model") or self.settings.openai_model or "gpt-4o-mini"
+        op = route.get("operation", "chat")
+        temp = temperature if temperature is not None else route.get("temperature")
+        return provider, model, op, temp
 
+    def _log_chat(self, *, use_case: str, provider: str, model: str, op: str, prompt_name: Optional[str], prompt_text: Optional[str], duration_ms: int, resp: Any) -> None:
         try:
-            log_call(
+            llm_logger.log_call(
                 caller=f"llm_client.chat:{use_case}",
                 provider=provider,
                 model=model,
                 operation=op,
                 prompt_name=prompt_name,
                 prompt_hash=sha256_text(prompt_text),
-                duration_ms=_dt_ms,
+                duration_ms=duration_ms,
                 status="ok",
-                usage=usage_obj,
+                usage=_usage_from_response(resp),
             )
         except Exception:
             pass
 
+    def chat(self, *, use_case: str, messages: List[Dict[str, str]], temperature: Optional[float] = None, prompt_name: Optional[str] = None, prompt_text: Optional[str] = None) -> Any:
+        provider, model, op, temp = self._chat_route(use_case, temperature)
+
+        if provider != "openai":
+            raise NotImplementedError(f"Provider not implemented: {provider}")
+
+        client = self._openai
+        if client is None:
+            client = _openai_client(self.settings.openai_api_key)
+
+        _t0 = time.time()
+        kwargs: Dict[str, Any] = {"model": model, "messages": messages}
+        # Only pass temperature if explicitly provided (some models only accept default)
+        if temp is not None:
+            kwargs["temperature"] = temp
+        resp = client.chat.completions.create(**kwargs)
+        _dt_ms = int((time.time() - _t0) * 1000)
+
+        self._log_chat(use_case=use_case, provider=provider, model=model, op=op, prompt_name=prompt_name, prompt_text=prompt_text, duration_ms=_dt_ms, resp=resp)
         return resp
 
-    # responses() removed: Responses API fallback no longer used
+    async def achat(self, *, use_case: str, messages: List[Dict[str, str]], temperature: Optional[float] = None, prompt_name: Optional[str] = None, prompt_text: Optional[str] = None) -> Any:
+        """Async variant of chat() backed by a per-instance AsyncOpenAI client."""
+        provider, model, op, temp = self._chat_route(use_case, temperature)
 
-    def enrich_company(
-        self,
-        *,
-        company_name: str,
-        domain: Optional[str],
-        user_message: str,
-        prompt_name: Optional[str] = None,
-        prompt_text: Optional[str] = None,
-        provider_override: Optional[str] = None,
-    ) -> Optional[Dict[str, Any]]:
-        """Gateway method for company enrichment across providers.
+        if provider != "openai":
+            raise NotImplementedError(f"Provider not implemented: {provider}")
 
-        Routes by config.llm_routes (use_case: "company_enrichment") unless overridden.
-        Returns a normalized dict matching our schema keys, or None on failure.
-        """
-        import time as _time
-        import json as _json
-        import re as _re
+        client = self._async_openai
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=self.settings.openai_api_key)
 
-        def _extract_json(text: Optional[str]) -> Optional[Dict[str, Any]]:
-            if not text:
-                return None
-            # Try raw parse first
-            try:
-                return _json.loads(text)
-            except Exception:
-                pass
-            # Try fenced code block
-            try:
-                m = _re.search(r"```(?:json)?\n([\s\S]*?)\n```", text)
-                if m:
-                    return _json.loads(m.group(1))
-            except Exception:
-                pass
-            # Try curly braces slice
-            try:
-                start = text.find("{")
-                end = text.rfind("}")
-                if start != -1 and end != -1 and end > start:
-                    return _json.loads(text[start : end + 1])
-            except Exception:
-                pass
-            return None
+        _t0 = time.time()
+        kwargs: Dict[str, Any] = {"model": model, "messages": messages}
+        if temp is not None:
+            kwargs["temperature"] = temp
+        resp = await client.chat.completions.create(**kwargs)
+        _dt_ms = int((time.time() - _t0) * 1000)
+
+        self._log_chat(use_case=use_case, provider=provider, model=model, op=op, prompt_name=prompt_name, prompt_text=prompt_text, duration_ms=_dt_ms, resp=resp)
+        return resp
+
+    # responses() removed: Responses API fallback no longer used
 
+    def _enrichment_route(self, provider_override: Optional[str]) -> Tuple[str, str, str]:
         route = ROUTES.get("company_enrichment", {})
         provider = (provider_override or route.get("provider") or self.settings.ai_provider or "openai").lower()
         model = route.get("model") or self.settings.openai_model or "gpt-4o-mini"
         op = route.get("operation", "company_enrichment")
+        return provider, model, op
 
+    def _enrichment_logger(
+        self,
+        *,
+        provider: str,
+        model: str,
+        op: str,
+        prompt_name: Optional[str],
+        prompt_text: Optional[str],
+        company_name: str,
+        domain: Optional[str],
+    ) -> Callable[..., None]:
         # Common logging envelope
         def _log(status: str, *, duration_ms: Optional[int] = None, error: Optional[str] = None, usage: Optional[Dict[str, Any]] = None) -> None:
             try:
-                log_call(
+                llm_logger.log_call(
                     caller=f"llm_client.enrich_company",
                     provider=provider,
                     model=model if provider == "openai" else None,
@@ -134,6 +371,34 @@ class LLMClient:
             except Exception:
                 pass
 
+        return _log
+
+    def enrich_company(
+        self,
+        *,
+        company_name: str,
+        domain: Optional[str],
+        user_message: str,
+        prompt_name: Optional[str] = None,
+        prompt_text: Optional[str] = None,
+        provider_override: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Gateway method for company enrichment across providers.
+
+        Routes by config.llm_routes (use_case: "company_enrichment") unless overridden.
+        Returns a normalized dict matching our schema keys, or None on failure.
+        """
+        provider, model, op = self._enrichment_route(provider_override)
+        _log = self._enrichment_logger(
+            provider=provider,
+            model=model,
+            op=op,
+            prompt_name=prompt_name,
+            prompt_text=prompt_text,
+            company_name=company_name,
+            domain=domain,
+        )
+
         # Simple retry/backoff on transient failures
         max_attempts = 2
         backoff_ms = 300
@@ -141,13 +406,8 @@ class LLMClient:
         # Remove OpenAI enrichment path; Linkup only
 
         if provider == "linkup":
-            try:
-                from pydantic import BaseModel  # type: ignore
-                from linkup import LinkupClient  # type: ignore
-                # Use unified app schema for enrichment
-                from models import EnrichmentResult as CompanyResearch  # type: ignore
-            except Exception as e:
-                _log("error", error=f"linkup import failed: {e}")
+            if self._linkup_import_error or CompanyResearch is None:
+                _log("error", error=f"linkup import failed: {self._linkup_import_error or 'models unavailable'}")
                 return None
 
             api_key = self.settings.linkup_api_key
@@ -155,10 +415,15 @@ class LLMClient:
                 _log("error", error="LINKUP_API_KEY missing")
                 return None
 
-            client = LinkupClient(api_key=api_key)
+            cache_keys = self._enrichment_cache_keys(provider, model, domain, user_message, prompt_text)
+            cached = self._cached_enrichment(cache_keys)
+            if cached is not None:
+                return cached
+
+            client = self._linkup
             last_err: Optional[str] = None
             for attempt in range(1, max_attempts + 1):
-                _t0 = _time.time()
+                _t0 = time.time()
                 try:
                     resp = client.search(
                         query=user_message,
@@ -166,27 +431,18 @@ class LLMClient:
                         output_type="structured",
                         structured_output_schema=CompanyResearch,
                     )
-                    dt = int((_time.time() - _t0) * 1000)
-                    result: Optional[Dict[str, Any]] = None
-                    if hasattr(resp, "model_dump"):
-                        result = resp.model_dump()
-                    elif isinstance(resp, dict):
-                        result = resp
-                    else:
-                        try:
-                            parsed = CompanyResearch.model_validate(resp)
-                            result = parsed.model_dump()
-                        except Exception:
-                            result = None
+                    dt = int((time.time() - _t0) * 1000)
+                    result = _linkup_result_to_dict(resp, CompanyResearch)
                     _log("ok", duration_ms=dt)
+                    self._store_enrichment(cache_keys, provider, model, result)
                     return result
                 except Exception as e:
-                    dt = int((_time.time() - _t0) * 1000)
+                    dt = int((time.time() - _t0) * 1000)
                     last_err = str(e)
                     _log("error", duration_ms=dt, error=last_err)
                     if attempt < max_attempts:
                         try:
-                            _time.sleep(backoff_ms / 1000.0)
+                            time.sleep(backoff_ms / 1000.0)
                         except Exception:
                             pass
                         continue
@@ -194,4 +450,99 @@ class LLMClient:
 
         raise NotImplementedError(f"Provider not implemented: {provider}")
 
+    async def aenrich_company(
+        self,
+        *,
+        company_name: str,
+        domain: Optional[str],
+        user_message: str,
+        prompt_name: Optional[str] = None,
+        prompt_text: Optional[str] = None,
+        provider_override: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of enrich_company(); same routing, retries and return shape."""
+
+        provider, model, op = self._enrichment_route(provider_override)
+        _log = self._enrichment_logger(
+            provider=provider,
+            model=model,
+            op=op,
+            prompt_name=prompt_name,
+            prompt_text=prompt_text,
+            company_name=company_name,
+            domain=domain,
+        )
+
+        max_attempts = 2
+        backoff_ms = 300
+
+        if provider == "linkup":
+            if self._linkup_import_error or CompanyResearch is None:
+                _log("error", error=f"linkup import failed: {self._linkup_import_error or 'models unavailable'}")
+                return None
+
+            api_key = self.settings.linkup_api_key
+            if not api_key:
+                _log("error", error="LINKUP_API_KEY missing")
+                return None
+
+            cache_keys = self._enrichment_cache_keys(provider, model, domain, user_message, prompt_text)
+            # SQLite lookups/writes run off the event loop
+            cached = await asyncio.to_thread(self._cached_enrichment, cache_keys)
+            if cached is not None:
+                return cached
+
+            client = self._linkup
+            for attempt in range(1, max_attempts + 1):
+                _t0 = time.time()
+                try:
+                    resp = await client.async_search(
+                        query=user_message,
+                        depth="standard",
+                        output_type="structured",
+                        structured_output_schema=CompanyResearch,
+                    )
+                    dt = int((time.time() - _t0) * 1000)
+                    result = _linkup_result_to_dict(resp, CompanyResearch)
+                    _log("ok", duration_ms=dt)
+                    await asyncio.to_thread(self._store_enrichment, cache_keys, provider, model, result)
+                    return result
+                except Exception as e:
+                    dt = int((time.time() - _t0) * 1000)
+                    _log("error", duration_ms=dt, error=str(e))
+                    if attempt < max_attempts:
+                        await asyncio.sleep(backoff_ms / 1000.0)
+                        continue
+            return None
+
+        raise NotImplementedError(f"Provider not implemented: {provider}")
+
+    async def abatch_enrich(self, items: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Run aenrich_company() for many companies concurrently.
+
+        Each item holds the keyword arguments for aenrich_company(). Concurrency is
+        bounded by settings.enrich_concurrency; results keep the order of ``items``
+        and failed items yield None. Items with an identical user_message share a
+        single in-flight call; each position still gets its own result dict.
+        """
+        sem = asyncio.Semaphore(max(1, int(self.settings.enrich_concurrency or 1)))
+
+        async def _one(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with sem:
+                try:
+                    return await self.aenrich_company(**item)
+                except Exception:
+                    return None
 
+        inflight: Dict[str, "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
+        futures = []
+        for item in items:
+            key = sha256_text(item.get("user_message"))
+            if key is None:
+                futures.append(asyncio.ensure_future(_one(item)))
+                continue
+            if key not in inflight:
+                inflight[key] = asyncio.ensure_future(_one(item))
+            futures.append(inflight[key])
+        results = await asyncio.gather(*futures)
+        return [dict(r) if r is not None else None for r in results]
@@ -1,71 +1,65 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
-
-
-def _parse_int_shorthand(value: Any) -> Optional[int]:
-    """Parse strings like '1.2K', '3M', '4500', '500+' into an integer."""
-    if value is None:
-        return None
-    try:
-        s = str(value).strip().upper()
-        if not s:
-            return None
-        if s.endswith('+'):
-            s = s[:-1]
-        import re as _re
-        m = _re.match(r"^([0-9]+(?:\.[0-9]+)?)([KMB]?)$", s)
-        if m:
-            num = float(m.group(1))
-            suf = m.group(2)
-            factor = 1
-            if suf == 'K':
-                factor = 1000
-            elif suf == 'M':
-                factor = 1000000
-            elif suf == 'B':
-                factor = 1000000000
-            return int(round(num * factor))
-        digits = ''.join(ch for ch in s if ch.isdigit())
-        return int(digits) if digits else None
-    except Exception:
-        return None
-
-
-def _parse_connections(value: Any) -> Optional[int]:
-    parsed = _parse_int_shorthand(value)
-    if parsed is None:
-        return None
-    return min(parsed, 500)
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+# Single shorthand parser for the project; re-exported for mapping callers
+from utils.number_parsing import _parse_connections, _parse_int_shorthand, _parse_int_shorthand_many  # noqa: F401
 
-def map_to_person_schema(profiles: List[Dict[str, Any]], lookup_date: Optional[str]) -> List[Dict[str, Any]]:
-    """Map extracted profiles to the Person schema (inline, simple)."""
-    mapped: List[Dict[str, Any]] = []
-    for p in profiles:
-        mapped.append({
-            'Contact_Name': p.get('name') or '',
-            'LinkedIn_Profile': p.get('profile_url') or None,
-            'Company': p.get('company') or None,
-            'Company_Website': None,
-            'Company_Domain': p.get('company_domain') or None,
-            'Location': p.get('location') or None,
-            'Position': p.get('current_position') or None,
-            'Connections_LinkedIn': _parse_connections(p.get('connection_count')) if p.get('connection_count') is not None else None,
-            'Followers_LinkedIn': _parse_int_shorthand(p.get('follower_count')) if p.get('follower_count') is not None else None,
-            'Website_Info': None,
-            'Phone_Info': p.get('phone') or '',
-            'Info_raw': p.get('summary') or '',
-            'Insights': p.get('summary_other') if isinstance(p.get('summary_other'), list) else [],
-            'Email': p.get('email') or None,
-            'Lookup_Date': lookup_date or None,
-            'Hot': False,
-            'Last_Interaction_Date': None,
-            'Status': None,
-            'Notes': [],
-        })
-    return mapped
+
+def _or_none(value: Any) -> Any:
+    return value or None
+
+
+def _or_empty(value: Any) -> Any:
+    return value or ''
+
+
+def _list_or_empty(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
 
 
+def _always_none(_value: Any) -> None:
+    return None
 
 
+# (input key, Person schema key, transform) in output column order; the
+# per-call/static tail (Lookup_Date, Hot, ...) is appended by _build_person_row.
+_KEY_MAP: List[Tuple[Optional[str], str, Callable[[Any], Any]]] = [
+    ('name', 'Contact_Name', _or_empty),
+    ('profile_url', 'LinkedIn_Profile', _or_none),
+    ('company', 'Company', _or_none),
+    (None, 'Company_Website', _always_none),
+    ('company_domain', 'Company_Domain', _or_none),
+    ('location', 'Location', _or_none),
+    ('current_position', 'Position', _or_none),
+    # Connections/Followers are parsed column-wise and filled in by _build_person_row
+    (None, 'Connections_LinkedIn', _always_none),
+    (None, 'Followers_LinkedIn', _always_none),
+    (None, 'Website_Info', _always_none),
+    ('phone', 'Phone_Info', _or_empty),
+    ('summary', 'Info_raw', _or_empty),
+    ('summary_other', 'Insights', _list_or_empty),
+    ('email', 'Email', _or_none),
+]
+
+
+def _build_person_row(p: Dict[str, Any], lookup: Optional[str], connections: Optional[int], followers: Optional[int]) -> Dict[str, Any]:
+    get = p.get
+    row = {out_k: fn(get(in_k)) for in_k, out_k, fn in _KEY_MAP}
+    # Keys already exist, so assignment keeps the column order
+    row['Connections_LinkedIn'] = connections
+    row['Followers_LinkedIn'] = followers
+    row['Lookup_Date'] = lookup
+    row['Hot'] = False
+    row['Last_Interaction_Date'] = None
+    row['Status'] = None
+    row['Notes'] = []
+    return row
+
+
+def map_to_person_schema(profiles: List[Dict[str, Any]], lookup_date: Optional[str]) -> List[Dict[str, Any]]:
+    """Map extracted profiles to the Person schema (row layout: _KEY_MAP)."""
+    lookup = lookup_date or None
+    followers = _parse_int_shorthand_many([p.get('follower_count') for p in profiles])
+    connections = [_parse_connections(p.get('connection_count')) for p in profiles]
+    return [_build_person_row(p, lookup, c, f) for p, c, f in zip(profiles, connections, followers)]
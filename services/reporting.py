@@ -4,29 +4,70 @@ import json
 from pathlib import Path
 from typing import Dict, Optional
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json accepts bytes as well
+    _json_loads = json.loads
 
-def _llm_usage_for_run(run_id: str) -> Dict[str, Dict[str, int]]:
-    """Aggregate LLM usage from logs/llm_calls.jsonl for the given run_id.
 
+def _llm_usage_from_index(db_path: str, run_id: str) -> Dict[str, Dict[str, int]]:
+    """Read per-provider usage for run_id from the llm_usage_agg table (empty if unavailable)."""
+    if not Path(db_path).exists():
+        return {}
+    try:
+        from db.connection import get_connection
+        from db.repos.llm_usage_repo import LLMUsageRepo
+        conn = get_connection(db_path)
+        try:
+            return LLMUsageRepo(conn).usage_for_run(run_id)
+        finally:
+            conn.close()
+    except Exception:
+        return {}
+
+
+def _llm_usage_for_run(run_id: str, db_path: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Aggregate LLM usage for the given run_id.
+
+    Served from this process's in-memory counters plus the llm_usage_agg
+    index in db_path (the run's database, when given); falls back to scanning
+    logs/llm_calls.jsonl for runs logged before the index existed.
     Returns dict like { 'openai': {'calls': N, 'tokens': T}, 'linkup': {...} }
     """
     result: Dict[str, Dict[str, int]] = {}
     try:
         from config.settings import get_settings
+        from utils.llm_logger import pending_usage
         settings = get_settings()
+        indexed = _llm_usage_from_index(db_path, run_id) if db_path else {}
+        for provider, stats in pending_usage(run_id).items():
+            bucket = indexed.setdefault(provider, {"calls": 0, "tokens": 0})
+            bucket["calls"] += stats["calls"]
+            bucket["tokens"] += stats["tokens"]
+        if indexed:
+            return indexed
         log_path = Path(settings.llm_log_path)
+        # Lines are written by a background thread; make sure ours have landed
+        from utils.llm_logger import flush_llm_log
+        flush_llm_log()
         if not log_path.exists():
             return result
-        with log_path.open("r", encoding="utf-8") as f:
+        # '"run_id": "<id>"' as written by json.dumps, or compact by orjson
+        value = json.dumps(run_id, ensure_ascii=False).encode("utf-8")
+        needles = (b'"run_id": ' + value, b'"run_id":' + value)
+        with log_path.open("rb") as f:
             for line in f:
+                # Cheap byte pre-filter: only parse lines that belong to this run
+                if needles[0] not in line and needles[1] not in line:
+                    continue
                 try:
-                    rec = json.loads(line)
+                    # The writer only emits objects; a stray non-dict line fails here
+                    rec = _json_loads(line)
+                    if rec.get("run_id") != run_id:
+                        continue
                 except Exception:
                     continue
-                if not isinstance(rec, dict):
-                    continue
-                if rec.get("run_id") != run_id:
-                    continue
                 provider = rec.get("provider") or "unknown"
                 usage = rec.get("usage") or {}
                 total_tokens = usage.get("total_tokens") or 0
@@ -41,7 +82,7 @@ def _llm_usage_for_run(run_id: str) -> Dict[str, Dict[str, int]]:
     return result
 
 
-def print_summary(data: dict, api_usage: dict, output_path: Optional[Path] = None) -> None:
+def print_summary(data: dict, api_usage: dict, output_path: Optional[Path] = None, db_path: Optional[str] = None) -> None:
     """Print summary of the extraction process."""
     metadata = data.get('metadata', {})
     extraction_stats = data.get('extraction_stats', {})
@@ -69,7 +110,7 @@ def print_summary(data: dict, api_usage: dict, output_path: Optional[Path] = Non
         settings = get_settings()
         run_id = os.getenv("RUN_ID")
         if run_id and settings.llm_trace:
-            usage = _llm_usage_for_run(run_id)
+            usage = _llm_usage_for_run(run_id, db_path)
             if usage:
                 print("LLM Usage:")
                 for provider, stats in usage.items():
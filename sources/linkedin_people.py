@@ -1,50 +1,67 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 from sources.base import LeadSource
 from sources.registry import register
 from typing import Optional
 
-from pipelines.steps.validate_data import DataValidator
-from config.settings import get_settings
-from google_searcher import GoogleSearcher
-from pipelines.steps.extract_data import LinkedInDataExtractor
+from config.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    # Imported lazily in _shared_searcher/run(): extract_data pulls in the OpenAI SDK
+    from google_searcher import GoogleSearcher
+
+
+# Process-wide searcher (rate limiting is lock-guarded inside GoogleSearcher),
+# keyed on the settings it was built with. Extractor and validator hold
+# per-run state and are built fresh by every run; they share only the OpenAI
+# client (see extract_data._shared_openai_client).
+_INIT_LOCK = threading.Lock()
+_SEARCHER: Optional[Tuple[Settings, GoogleSearcher]] = None
+
+
+def _shared_searcher(settings: Settings) -> GoogleSearcher:
+    global _SEARCHER
+    from google_searcher import GoogleSearcher
+    with _INIT_LOCK:
+        # Settings are frozen; a reloaded settings object rebuilds the searcher
+        if _SEARCHER is None or _SEARCHER[0] is not settings:
+            _SEARCHER = (settings, GoogleSearcher(settings))
+        return _SEARCHER[1]
 
 
 class LinkedInPeopleSource(LeadSource):
     source_name = "linkedin_people_google"
     entity_type = "person"
 
-    def __init__(self):
-        # Lazy-init heavy/AI-dependent components to avoid failures in environments without AI keys
-        self._searcher: Optional[GoogleSearcher] = None
-        self._extractor: Optional[LinkedInDataExtractor] = None
-        self._validator: Optional[DataValidator] = None
-
     def run(self, terms: List[str], max_results: int) -> List[Dict[str, Any]]:
-        if self._searcher is None:
-            self._searcher = GoogleSearcher()
-        if self._extractor is None:
-            settings = get_settings()
-            # Friendly prerequisite checks for AI extraction
-            if not settings.ai_enabled or not settings.openai_api_key:
-                raise RuntimeError(
-                    "AI extraction is required for people ingestion. Set AI_ENABLED=true and provide OPENAI_API_KEY in your environment (.env)."
-                )
-            self._extractor = LinkedInDataExtractor(
-                use_ai=settings.ai_enabled,
-                openai_api_key=settings.openai_api_key,
-                openai_model=None,
+        # Resolved on every run (not pinned on the instance, which the registry
+        # caches) so settings changes and the AI prerequisite check always apply
+        from pipelines.steps.extract_data import LinkedInDataExtractor
+        from pipelines.steps.validate_data import DataValidator
+
+        settings = get_settings()
+        # Friendly prerequisite checks for AI extraction
+        if not settings.ai_enabled or not settings.openai_api_key:
+            raise RuntimeError(
+                "AI extraction is required for people ingestion. Set AI_ENABLED=true and provide OPENAI_API_KEY in your environment (.env)."
             )
-        if self._validator is None:
-            self._validator = DataValidator()
-
-        results = self._searcher.search_linkedin_profiles(terms, max_results)
-        profiles = self._extractor.extract_all_profiles(results)
-        valid = self._validator.validate_all_profiles(profiles)
-        unique = self._validator.remove_duplicates(valid)
-        cleaned = [self._validator.clean_profile_data(p) for p in unique]
+        searcher = _shared_searcher(settings)
+        # Fresh per run: both track duplicates/stats, so concurrent runs never share them
+        extractor = LinkedInDataExtractor(
+            use_ai=settings.ai_enabled,
+            openai_api_key=settings.openai_api_key,
+            openai_model=None,
+        )
+        validator = DataValidator()
+
+        results = searcher.search_linkedin_profiles(terms, max_results)
+        profiles = extractor.extract_all_profiles(results)
+        valid = validator.validate_all_profiles(profiles)
+        unique = validator.remove_duplicates(valid)
+        cleaned = [validator.clean_profile_data(p) for p in unique]
         return cleaned
 
 
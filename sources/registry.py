@@ -1,23 +1,31 @@
 from __future__ import annotations
 
-from typing import Dict, Type, Any
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
-_REGISTRY: Dict[str, Any] = {}
+# name -> (factory, cached instance or None until first get_source)
+_REGISTRY: Dict[str, Tuple[Callable[[], Any], Optional[Any]]] = {}
 
 
 def register(name: str, factory) -> None:
-    _REGISTRY[name] = factory
+    _REGISTRY[name] = (factory, None)
 
 
 def get_source(name: str):
     if name not in _REGISTRY:
         raise KeyError(f"Unknown source: {name}")
-    return _REGISTRY[name]()
+    factory, instance = _REGISTRY[name]
+    if instance is None:
+        instance = factory()
+        _REGISTRY[name] = (factory, instance)
+    return instance
 
 
-def available_sources() -> Dict[str, Any]:
-    return dict(_REGISTRY)
-
+def reset_source(name: str) -> None:
+    """Drop the cached instance so the next get_source builds a fresh one."""
+    if name in _REGISTRY:
+        _REGISTRY[name] = (_REGISTRY[name][0], None)
 
 
+def available_sources() -> Dict[str, Any]:
+    return {name: factory for name, (factory, _instance) in _REGISTRY.items()}
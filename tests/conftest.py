@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import os
+import sqlite3
 import sys
 from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
 
 
 def pytest_configure():
@@ -14,4 +18,152 @@ def pytest_configure():
     os.environ.setdefault("RUN_ENV", "test")
 
 
+@pytest.fixture(autouse=True)
+def _isolate_settings_and_llm_logger(monkeypatch):
+    """Undo env changes first, then drop settings/trace caches built from them.
+
+    RUN_ID is snapshotted too: cmd_run assigns os.environ["RUN_ID"] directly.
+    """
+    from utils import llm_logger
+
+    monkeypatch.delenv("RUN_ID", raising=False)
+    yield
+    monkeypatch.undo()
+    llm_logger.flush_llm_log()
+    llm_logger._close_log_fd()
+    llm_logger.reset_llm_logger_cache()
+    with llm_logger._USAGE_LOCK:
+        llm_logger._USAGE.clear()
+
+
+@pytest.fixture(scope="session")
+def schema_template_db():
+    """In-memory DB bootstrapped once per session; copied into each fresh_db."""
+    from db import schema
+
+    template = sqlite3.connect(":memory:")
+    schema.bootstrap(template)
+    yield template
+    template.close()
+
+
+@pytest.fixture
+def memory_db(schema_template_db):
+    """In-memory copy of the bootstrapped template for repo/step unit tests."""
+    conn = sqlite3.connect(":memory:")
+    schema_template_db.backup(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def fresh_db_path(tmp_path, schema_template_db) -> Path:
+    """Path to a file DB with the full schema, copied page-wise from the template."""
+    path = tmp_path / "test.db"
+    dst = sqlite3.connect(str(path))
+    try:
+        schema_template_db.backup(dst)
+    finally:
+        dst.close()
+    return path
+
+
+@pytest.fixture
+def fresh_db(fresh_db_path):
+    """Open connection to a freshly copied, bootstrapped file DB (on-disk semantics)."""
+    from db.connection import get_connection
+
+    conn = get_connection(str(fresh_db_path))
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def seed_companies() -> Callable[[Path, List[tuple]], None]:
+    """Insert (name, domain) rows into companies in one transaction."""
+
+    from db.connection import get_connection
+
+    def _seed(path: Path, rows: List[tuple]) -> None:
+        conn = get_connection(str(path))
+        try:
+            with conn:
+                conn.executemany("INSERT INTO companies(name, domain) VALUES(?, ?)", rows)
+        finally:
+            conn.close()
+
+    return _seed
+
+
+@pytest.fixture
+def read_conn():
+    """Open a read-only URI connection to a DB path; closed at teardown."""
+    opened: List[sqlite3.Connection] = []
+
+    def _open(path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True)
+        opened.append(conn)
+        return conn
+
+    yield _open
+    for conn in opened:
+        conn.close()
+
+
+class _StubPeopleSource:
+    """Network/AI-free people source returning one realistic profile."""
+
+    source_name = "linkedin_people_google"
+    entity_type = "person"
+
+    def run(self, terms: List[str], max_results: int) -> List[Dict[str, Any]]:
+        # Fresh dicts per call: the CLI annotates records in place
+        return [
+            {
+                "name": "Alice Example",
+                "profile_url": "https://www.linkedin.com/in/Alice-Example-12345/",
+                "current_position": "Software Engineer",
+                "company": "Acme GmbH",
+                "company_domain": "acme.com",
+                "location": "Berlin, Germany",
+                "follower_count": "1K",
+                "connection_count": "500+",
+            }
+        ]
+
+
+_SHARED_PEOPLE_STUB = _StubPeopleSource()
+
+
+@pytest.fixture
+def stubbed_people_registry(monkeypatch) -> _StubPeopleSource:
+    """Serve the shared stub as linkedin_people_google for this test only."""
+    import sources.registry as reg
+
+    monkeypatch.setitem(
+        reg._REGISTRY, "linkedin_people_google", (_StubPeopleSource, _SHARED_PEOPLE_STUB)
+    )
+    return _SHARED_PEOPLE_STUB
+
+
+@pytest.fixture(scope="session")
+def cli_module():
+    """The cli module, imported once per session (main() reads sys.argv on each call)."""
+    import cli  # type: ignore
+
+    return cli
+
+
+@pytest.fixture
+def run_cli(cli_module, monkeypatch) -> Callable[[List[str]], None]:
+    """Run cli.main() in-process with the given args; non-zero exits re-raise."""
+
+    def _run(args_list: List[str]) -> None:
+        monkeypatch.setattr(sys, "argv", ["cli.py", *args_list])
+        try:
+            cli_module.main()
+        except SystemExit as e:
+            if int(getattr(e, "code", 0) or 0) not in (0, None):
+                raise
 
+    return _run
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from db.repos.llm_cache_repo import LLMCacheRepo
+
+
+def test_llm_cache_roundtrip_respects_ttl(memory_db):
+    db = memory_db
+    repo = LLMCacheRepo(db)
+    assert repo.get("k1", 0.0) is None
+    repo.put("k1", "linkup", None, '{"Company": "Acme"}', created_at=1000.0)
+    assert repo.get("k1", 999.0) == ('{"Company": "Acme"}', 1000.0)
+    # Entries older than the freshness bound are treated as misses
+    assert repo.get("k1", 1001.0) is None
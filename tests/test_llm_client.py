@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import services.llm_client as llm
+
+
+def test_abatch_enrich_keeps_order_and_isolates_failures(monkeypatch):
+    async def _fake_aenrich(self, **kwargs):
+        name = kwargs["company_name"]
+        if name == "Broken":
+            raise RuntimeError("boom")
+        # Finish in reverse order to prove results are not completion-ordered
+        await asyncio.sleep(0.01 if name == "Acme" else 0)
+        return {"Company": name}
+
+    monkeypatch.setattr(llm.LLMClient, "aenrich_company", _fake_aenrich)
+    items = [
+        {"company_name": "Acme", "domain": "acme.com", "user_message": "a"},
+        {"company_name": "Broken", "domain": None, "user_message": "b"},
+        {"company_name": "Beta", "domain": "beta.io", "user_message": "c"},
+    ]
+    results = asyncio.run(llm.LLMClient().abatch_enrich(items))
+    assert results == [{"Company": "Acme"}, None, {"Company": "Beta"}]
+
+
+def test_abatch_enrich_dedupes_identical_prompts(monkeypatch):
+    calls = []
+
+    async def _fake_aenrich(self, **kwargs):
+        calls.append(kwargs["user_message"])
+        await asyncio.sleep(0)
+        return {"Company": kwargs["company_name"]}
+
+    monkeypatch.setattr(llm.LLMClient, "aenrich_company", _fake_aenrich)
+    items = [
+        {"company_name": "Acme", "domain": "acme.com", "user_message": "same"},
+        {"company_name": "Acme", "domain": "acme.com", "user_message": "same"},
+        {"company_name": "Beta", "domain": "beta.io", "user_message": "other"},
+    ]
+    results = asyncio.run(llm.LLMClient().abatch_enrich(items))
+    assert sorted(calls) == ["other", "same"]
+    assert results == [{"Company": "Acme"}, {"Company": "Acme"}, {"Company": "Beta"}]
+    assert results[0] is not results[1]
+
+
+def test_enrichment_cache_keys_share_company_key_across_prompts():
+    client = llm.LLMClient()
+    a = client._enrichment_cache_keys("linkup", "m", "Acme.com", "prompt v1", "template")
+    b = client._enrichment_cache_keys("linkup", "m", "acme.com", "prompt v1 with website excerpt", "template")
+    assert a[0] != b[0]
+    assert a[1] == b[1]
+    # An edited prompt template must not reuse the old company entry
+    c = client._enrichment_cache_keys("linkup", "m", "acme.com", "prompt v1", "template v2")
+    assert c[1] != a[1]
+    # Without a domain only the exact-prompt key is available
+    assert len(client._enrichment_cache_keys("linkup", "m", None, "prompt v1")) == 1
+
+
+def test_linkup_model_result_uses_alias_keys_and_drops_none():
+    from models import EnrichmentResult
+
+    resp = EnrichmentResult(Company="Acme", Industries=["Software"])
+    out = llm._linkup_result_to_dict(resp, EnrichmentResult)
+    assert out["Company"] == "Acme"
+    assert out["Industries"] == ["Software"]
+    assert out["Recent_News"] == []
+    assert "Legal_Form" not in out
+
+
+def test_llm_client_cache_uses_given_db_and_closes_only_its_own_connection(tmp_path, monkeypatch, memory_db):
+    import sqlite3
+
+    from config.settings import invalidate_settings_cache
+
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "settings.db"))
+    invalidate_settings_cache()
+    # The cache follows the run's DB, not settings.db_path
+    with llm.LLMClient(db_path=str(tmp_path / "run.db")) as client:
+        owned = client._cache_repo().conn
+    with pytest.raises(sqlite3.ProgrammingError):
+        owned.execute("SELECT 1")
+    assert (tmp_path / "run.db").exists()
+    assert not (tmp_path / "settings.db").exists()
+
+    with llm.LLMClient(cache_conn=memory_db) as client:
+        assert client._cache_repo().conn is memory_db
+    assert memory_db.execute("SELECT COUNT(*) FROM llm_cache").fetchone() == (0,)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-from utils.llm_logger import log_call
+from utils import llm_logger
+from utils.llm_logger import flush_llm_log, reset_llm_logger_cache
 
 
 def test_llm_trace_writes_jsonl(tmp_path, monkeypatch):
@@ -11,8 +13,9 @@ def test_llm_trace_writes_jsonl(tmp_path, monkeypatch):
     monkeypatch.setenv("LLM_TRACE", "true")
     monkeypatch.setenv("LLM_LOG_PATH", str(log_file))
     monkeypatch.setenv("RUN_ID", "test-run-123")
-
-    log_call(
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "usage.db"))
+    reset_llm_logger_cache()
+    llm_logger.log_call(
         caller="unit.test",
         provider="openai",
         model="gpt-x",
@@ -24,6 +27,7 @@ def test_llm_trace_writes_jsonl(tmp_path, monkeypatch):
         usage={"total_tokens": 10},
         extras={"company_name": "Acme"},
     )
+    flush_llm_log()
 
     assert log_file.exists()
     lines = log_file.read_text(encoding="utf-8").strip().splitlines()
@@ -33,6 +37,80 @@ def test_llm_trace_writes_jsonl(tmp_path, monkeypatch):
     assert rec["provider"] == "openai"
     assert rec["operation"] == "chat.completions.create"
     assert rec["run_id"] == "test-run-123"
+    assert rec["extras"] == {"company_name": "Acme"}
+    # ISO 8601 UTC timestamp only; no redundant epoch field
+    ts = datetime.fromisoformat(rec["ts"])
+    assert ts.utcoffset() == timedelta(0)
+    assert abs(datetime.now(timezone.utc) - ts) < timedelta(minutes=1)
+    assert "ts_ns" not in rec
     assert rec.get("usage", {}).get("total_tokens") == 10
 
+    # Usage is counted in memory: nothing is written to settings.db_path
+    from services.reporting import _llm_usage_for_run
+    assert not (tmp_path / "usage.db").exists()
+    assert _llm_usage_for_run("test-run-123") == {"openai": {"calls": 1, "tokens": 10}}
+
+
+def test_flush_usage_writes_into_the_given_db(fresh_db_path):
+    from db.connection import get_connection
+    from db.repos.llm_usage_repo import LLMUsageRepo
+    from services.reporting import _llm_usage_for_run
+
+    llm_logger._count_usage("run-flush", "openai", {"total_tokens": 4})
+    llm_logger._count_usage("run-flush", "openai", {"total_tokens": 6})
+    llm_logger._count_usage("run-other", "linkup", None)
+    conn = get_connection(str(fresh_db_path))
+    try:
+        llm_logger.flush_usage(conn, "run-flush")
+        assert LLMUsageRepo(conn).usage_for_run("run-flush") == {"openai": {"calls": 2, "tokens": 10}}
+    finally:
+        conn.close()
+    assert llm_logger.pending_usage("run-flush") == {}
+    assert llm_logger.pending_usage("run-other") == {"linkup": {"calls": 1, "tokens": 0}}
+    assert _llm_usage_for_run("run-flush", str(fresh_db_path)) == {"openai": {"calls": 2, "tokens": 10}}
+
+
+def test_log_call_is_noop_until_enabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_TRACE", "false")
+    monkeypatch.setenv("LLM_LOG_PATH", str(tmp_path / "llm_calls.jsonl"))
+    monkeypatch.delenv("RUN_ID", raising=False)
+    reset_llm_logger_cache()
+    llm_logger.log_call(caller="unit.test", provider="openai", model=None, operation="op")
+    # The first call resolved settings and bound the no-op
+    assert llm_logger.log_call is llm_logger._noop_log_call
+    assert not (tmp_path / "llm_calls.jsonl").exists()
+    llm_logger.enable()
+    llm_logger.log_call(caller="unit.test", provider="openai", model=None, operation="op")
+    flush_llm_log()
+    rec = json.loads((tmp_path / "llm_calls.jsonl").read_text(encoding="utf-8"))
+    # Absent run_id/extras are omitted rather than written as null
+    assert "run_id" not in rec and "extras" not in rec
+
+
+def test_llm_log_reopens_after_rotation(tmp_path, monkeypatch):
+    import utils.llm_logger as llm_logger
 
+    monkeypatch.setattr(llm_logger, "_INODE_CHECK_INTERVAL", 0.0)
+    log_file = tmp_path / "llm_calls.jsonl"
+    llm_logger._append_bytes(log_file, b'{"n":1}\n')
+    log_file.rename(tmp_path / "llm_calls.jsonl.1")
+    llm_logger._append_bytes(log_file, b'{"n":2}\n')
+
+    assert (tmp_path / "llm_calls.jsonl.1").read_bytes() == b'{"n":1}\n'
+    assert log_file.read_bytes() == b'{"n":2}\n'
+
+
+def test_import_does_not_read_settings():
+    import subprocess
+    import sys
+
+    # Fresh interpreter: importing the logger must leave the settings cache empty
+    code = (
+        "import utils.llm_logger as l, config.settings as s; "
+        "print(s.get_settings.cache_info().currsize, l.log_call is l._first_log_call)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[1],
+        capture_output=True, text=True, check=True,
+    )
+    assert out.stdout.split() == ["0", "True"]
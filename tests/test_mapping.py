@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from services.mapping import _parse_int_shorthand, _parse_int_shorthand_many, map_to_person_schema
+
+
+def test_parse_int_shorthand_batch_matches_scalar():
+    values = ['1.2K', '3M', '4500', '500+', '', None, 'abc 12', ' 2b ', '1.2K']
+    assert _parse_int_shorthand_many(values) == [_parse_int_shorthand(v) for v in values]
+    # The scalar parser stays scalar: no element-wise result for sequences
+    assert not isinstance(_parse_int_shorthand(values), list)
+
+
+def test_map_to_person_schema_parses_counts_column_wise():
+    rows = map_to_person_schema([
+        {'name': 'A', 'connection_count': '1K', 'follower_count': '1.5K'},
+        {'connection_count': None, 'follower_count': '42'},
+    ], '2025-01-01')
+    assert [r['Connections_LinkedIn'] for r in rows] == [500, None]
+    assert [r['Followers_LinkedIn'] for r in rows] == [1500, 42]
+    assert rows[1]['Contact_Name'] == '' and rows[1]['Lookup_Date'] == '2025-01-01'
+
+
+def test_normalize_linkedin_profile_url_canonical_fast_path():
+    from services.domain_utils import normalize_linkedin_profile_url
+
+    canonical = "https://linkedin.com/in/alice-example-12345"
+    assert normalize_linkedin_profile_url(canonical) == canonical
+    assert normalize_linkedin_profile_url("https://www.linkedin.com/in/Alice-Example-12345/") == canonical
+    assert normalize_linkedin_profile_url(canonical + "/de") == canonical
+    assert normalize_linkedin_profile_url(canonical + "?trk=x") == canonical
+    assert normalize_linkedin_profile_url("https://linkedin.com/in/Alice") == "https://linkedin.com/in/alice"
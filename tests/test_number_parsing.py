@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from utils.number_parsing import _parse_connections, _parse_int_shorthand
+
+
+def test_parse_int_shorthand_suffixes_and_fallback():
+    cases = {
+        '1.2K': 1200,
+        '3M': 3000000,
+        ' 2b ': 2000000000,
+        '4500': 4500,
+        '500+': 500,
+        '1,234': 1234,
+        'abc 12': 12,
+        '': None,
+        'n/a': None,
+        None: None,
+    }
+    assert {k: _parse_int_shorthand(k) for k in cases} == cases
+
+
+def test_parse_connections_caps_at_500():
+    assert _parse_connections('1.2K') == 500
+    assert _parse_connections('499') == 499
+    assert _parse_connections(None) is None
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from db.repos.people_repo import PeopleRepo
+
+
+def test_upsert_many_inserts_and_merges_with_coalesce(memory_db):
+    db = memory_db
+    repo = PeopleRepo(db)
+    repo.upsert_many([
+        {"linkedin_profile": "https://www.linkedin.com/in/a", "first_name": "Ann", "email": "a@x.com"},
+        {"linkedin_profile": "https://www.linkedin.com/in/b", "first_name": "Bob", "insights_text": ["x", "", "y"]},
+    ])
+    # Second pass leaves email untouched (NULL never overwrites) and updates the title
+    repo.upsert_many([{"linkedin_profile": "https://www.linkedin.com/in/a", "title_current": "CTO"}])
+    rows = db.execute(
+        "SELECT linkedin_profile, first_name, email, title_current, insights_text, lookup_date IS NOT NULL FROM people ORDER BY linkedin_profile"
+    ).fetchall()
+    assert rows == [
+        ("https://www.linkedin.com/in/a", "Ann", "a@x.com", "CTO", None, 1),
+        ("https://www.linkedin.com/in/b", "Bob", None, None, "x; y", 1),
+    ]
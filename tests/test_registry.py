@@ -4,6 +4,17 @@ import importlib
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _reset_cached_sources():
+    """Leave no cached source instances behind for later tests."""
+    yield
+    import sources  # noqa: F401
+    from sources.registry import available_sources, reset_source
+
+    for name in available_sources():
+        reset_source(name)
+
+
 def test_builtin_sources_registered():
     # Import package to trigger registration
     import sources  # noqa: F401
@@ -44,3 +55,13 @@ def test_linkedin_people_requires_ai_keys(monkeypatch):
         raised = True
     assert raised is True
 
+
+
+def test_get_source_caches_instance_until_reset():
+    import sources  # noqa: F401
+    from sources.registry import get_source, reset_source
+
+    first = get_source("linkedin_people_google")
+    assert get_source("linkedin_people_google") is first
+    reset_source("linkedin_people_google")
+    assert get_source("linkedin_people_google") is not first
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import json
+
+from config.settings import invalidate_settings_cache
+from services.reporting import _llm_usage_for_run
+
+
+def test_llm_usage_for_run_aggregates_only_matching_run(tmp_path, monkeypatch):
+    log_file = tmp_path / "llm_calls.jsonl"
+    records = [
+        {"run_id": "run-a", "provider": "openai", "usage": {"total_tokens": 10}},
+        {"run_id": "run-b", "provider": "openai", "usage": {"total_tokens": 99}},
+        {"run_id": "run-a", "provider": "openai", "usage": {"total_tokens": 5}},
+        {"run_id": "run-a", "provider": "linkup", "usage": {}},
+        {"run_id": "run-a-2", "provider": "openai", "usage": {"total_tokens": 7}},
+    ]
+    lines = [json.dumps(r, ensure_ascii=False) for r in records]
+    lines.insert(1, "not json run-a")
+    # Compact separators (orjson) must match too
+    lines.append('{"run_id":"run-a","provider":"linkup","usage":{"total_tokens":1}}')
+    log_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.setenv("LLM_LOG_PATH", str(log_file))
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "no_index.db"))
+    invalidate_settings_cache()
+    usage = _llm_usage_for_run("run-a")
+    assert usage == {"openai": {"calls": 2, "tokens": 15}, "linkup": {"calls": 2, "tokens": 1}}
@@ -1,46 +1,31 @@
 from __future__ import annotations
 
-import os
-import sys
-from types import SimpleNamespace
-
-import importlib
-
-
-def _run_cli_with_args(args_list):
-    # Simulate argv and import cli fresh
-    argv_backup = sys.argv[:]
-    try:
-        sys.argv = ["cli.py"] + args_list
-        if "cli" in sys.modules:
-            del sys.modules["cli"]
-        import cli  # noqa: F401
-    finally:
-        sys.argv = argv_backup
-
-
-def test_default_runs_linkedin_people(monkeypatch):
-    # Make run fast and deterministic
-    monkeypatch.setenv("AI_ENABLED", "false")
-    monkeypatch.setenv("RUN_ENV", "test")
-    # Monkeypatch LinkedInPeopleSource to return a small person list
-    import sources
-    from sources.registry import get_source
-    src = get_source("linkedin_people_google")
-
-    def _fake_run(terms, max_results):
-        return [{"name": "Alice", "profile_url": "https://linkedin.com/in/alice"}]
-
-    src.run = _fake_run  # type: ignore
-
-    # Run cli pipeline ingest-people
-    _run_cli_with_args(["run", "ingest-people", "--query", "Engineer Berlin", "--max-results", "1"])  # Should not crash
-
-
-def test_maps_scaffold_demo_path(monkeypatch):
-    monkeypatch.setenv("DEMO", "true")
-    # Run companies-only pipeline via cli; should not crash
-    _run_cli_with_args(["run", "ingest-people", "--terms", "AI", "Berlin"])  # pipeline accepts terms
-
-
 
+def test_default_runs_linkedin_people(cli_module):
+    args = cli_module.build_parser().parse_args(["run", "ingest-people", "--query", "Engineer Berlin"])
+    assert args.func is cli_module.cmd_run
+    assert args.pipeline == "ingest-people"
+    assert args.query == "Engineer Berlin"
+    # No --source: cmd_run falls back to linkedin_people_google
+    assert args.source is None
+    assert args.write_db is False
+
+
+def test_run_source_is_repeatable(cli_module):
+    args = cli_module.build_parser().parse_args([
+        "--db", "x.db", "run", "ingest-people", "-t", "a", "b",
+        "-s", "linkedin_people_google", "-s", "companies_demo", "-m", "3", "--write-db",
+    ])
+    assert args.db == "x.db"
+    assert args.terms == ["a", "b"]
+    assert args.source == ["linkedin_people_google", "companies_demo"]
+    assert args.max_results == 3
+    assert args.write_db is True
+
+
+def test_enrich_companies_routing(cli_module):
+    args = cli_module.build_parser().parse_args(["run", "enrich-companies", "--limit", "2", "--progress"])
+    assert args.func is cli_module.cmd_run
+    assert args.pipeline == "enrich-companies"
+    assert args.limit == 2
+    assert args.progress is True
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import sqlite3
+
+from db import schema
+
+
+def test_bootstrap_backfills_old_tables_and_records_version():
+    db = sqlite3.connect(":memory:")
+    try:
+        # A pre-versioning people table missing most columns
+        db.execute(
+            "CREATE TABLE people (id INTEGER PRIMARY KEY AUTOINCREMENT, linkedin_profile TEXT NOT NULL UNIQUE, first_name TEXT, last_name TEXT, company_id INTEGER)"
+        )
+        schema.bootstrap(db)
+        cols = {row[1] for row in db.execute("PRAGMA table_info(people)")}
+        assert {"connections_linkedin", "is_hot", "search_query_id"} <= cols
+        assert db.execute("SELECT version FROM schema_version").fetchone() == (schema.SCHEMA_VERSION,)
+        # Current schema: second bootstrap returns before touching anything
+        db.execute("DROP VIEW v_people_with_company")
+        schema.bootstrap(db)
+        assert db.execute("SELECT name FROM sqlite_master WHERE name = 'v_people_with_company'").fetchone() is None
+    finally:
+        db.close()
@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import sqlite3
-
-from db import schema
 from pipelines.runner import Pipeline, RunContext
 from pipelines.steps.validate_people import ValidatePeople
 from pipelines.steps.persist_people import PersistPeople
@@ -21,37 +18,64 @@ def test_validate_people_skips_strict_for_mapped():
     assert out.people and isinstance(out.people, list)
 
 
-def test_persist_people_inserts_and_links(tmp_path):
-    db_path = tmp_path / 't.db'
-    conn = sqlite3.connect(str(db_path))
-    try:
-        schema.bootstrap(conn)
-        ppl = [{
-            'Contact_Name': 'Dr. Alice Example',
-            'LinkedIn_Profile': 'https://linkedin.com/in/alice',
-            'Position': 'Engineer',
-            'source_name': 'linkedin_people_google',
-            'source_query': 'Engineer Berlin',
-            'Company': 'Acme',
-            'Company_Domain': 'acme.com'
-        }]
-        pipeline = Pipeline([ValidatePeople(), PersistPeople(conn)])
-        ctx = RunContext()
-        ctx.people = ppl
-        out = pipeline.run(ctx)
-        assert out.meta.get('processed_people') == 1
-        cur = conn.cursor()
-        cur.execute("SELECT first_name, last_name, title_current, search_query_id FROM people")
-        row = cur.fetchone()
-        assert row is not None
-        first_name, last_name, title_current, search_query_id = row
-        # Degree prefix stripped from name, appended to title in parentheses
-        assert first_name == 'Alice' and last_name == 'Example'
-        assert '(Dr' in title_current or '(Dr.' in title_current
-        assert isinstance(search_query_id, int) and search_query_id > 0
-        cur.execute("SELECT COUNT(*) FROM companies WHERE domain = ?", ('acme.com',))
-        assert cur.fetchone()[0] == 1
-    finally:
-        conn.close()
+def test_persist_people_inserts_and_links(memory_db):
+    conn = memory_db
+    ppl = [{
+        'Contact_Name': 'Dr. Alice Example',
+        'LinkedIn_Profile': 'https://linkedin.com/in/alice',
+        'Position': 'Engineer',
+        'source_name': 'linkedin_people_google',
+        'source_query': 'Engineer Berlin',
+        'Company': 'Acme',
+        'Company_Domain': 'acme.com'
+    }]
+    pipeline = Pipeline([ValidatePeople(), PersistPeople(conn)])
+    ctx = RunContext()
+    ctx.people = ppl
+    out = pipeline.run(ctx)
+    assert out.meta.get('processed_people') == 1
+    row = conn.execute(
+        "SELECT first_name, last_name, title_current, search_query_id,"
+        " (SELECT COUNT(*) FROM companies WHERE domain = ?) FROM people",
+        ('acme.com',),
+    ).fetchone()
+    assert row is not None
+    first_name, last_name, title_current, search_query_id, acme_companies = row
+    # Degree prefix stripped from name, appended to title in parentheses
+    assert first_name == 'Alice' and last_name == 'Example'
+    assert '(Dr' in title_current or '(Dr.' in title_current
+    assert isinstance(search_query_id, int) and search_query_id > 0
+    assert acme_companies == 1
+
+
+
+
+def test_persist_people_falls_back_per_person_when_batch_fails(memory_db, monkeypatch):
+    from db.repos.companies_repo import CompaniesRepo
 
+    def _boom(self, *args, **kwargs):
+        raise RuntimeError("batch failed")
 
+    real_upsert = CompaniesRepo.upsert_company
+
+    def _upsert_company(self, name, domain, *args, **kwargs):
+        if domain == 'bad.example':
+            raise RuntimeError("bad row")
+        return real_upsert(self, name, domain, *args, **kwargs)
+
+    monkeypatch.setattr(CompaniesRepo, "upsert_many_by_domain", _boom)
+    monkeypatch.setattr(CompaniesRepo, "upsert_company", _upsert_company)
+    progress = []
+    ctx = RunContext()
+    ctx.people = [
+        {'Contact_Name': 'Alice Example', 'LinkedIn_Profile': 'https://linkedin.com/in/alice', 'Company': 'Acme', 'Company_Domain': 'acme.com'},
+        {'Contact_Name': 'Bob Broken', 'LinkedIn_Profile': 'https://linkedin.com/in/bob', 'Company': 'Bad', 'Company_Domain': 'bad.example'},
+    ]
+    out = PersistPeople(memory_db, on_processed=progress.append).run(ctx)
+    assert out.meta.get('processed_people') == 1
+    assert progress == [1]
+    rows = memory_db.execute(
+        "SELECT p.first_name, c.domain FROM people p LEFT JOIN companies c ON c.id = p.company_id ORDER BY p.first_name"
+    ).fetchall()
+    # Bob stays as written by the people batch, but unlinked and not counted
+    assert rows == [('Alice', 'acme.com'), ('Bob', None)]
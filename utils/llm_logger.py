@@ -1,37 +1,308 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import queue
+import sqlite3
+import threading
 import time
 import hashlib
-from datetime import datetime, timezone
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+from config.settings import get_settings, invalidate_settings_cache
 
-def _as_bool(value: Optional[str]) -> bool:
-    if value is None:
-        return False
-    return str(value).strip().lower() in {"1", "true", "yes", "y", "on"}
+try:
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+    def _dumps_line(obj: Any) -> bytes:
+        # datetimes serialize natively as RFC 3339 (same text as isoformat())
+        return orjson.dumps(obj, option=_ORJSON_OPTS)
+except ImportError:  # optional speedup; same compact UTF-8 JSON via stdlib
+    def _json_default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def _dumps_line(obj: Any) -> bytes:
+        line = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+        return (line + "\n").encode("utf-8")
+
+
+# Parent directories already created/confirmed by _ensure_parent_dir
+_DIR_READY: Set[Path] = set()
 
 
 def _ensure_parent_dir(path: Path) -> None:
+    parent = path.parent
+    if parent in _DIR_READY:
+        return
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
+        parent.mkdir(parents=True, exist_ok=True)
+        _DIR_READY.add(parent)
     except Exception:
         pass
 
 
+# Persistent O_APPEND descriptor for LLM_LOG_PATH. Reopened when the path
+# changes, or when the file was rotated/removed (inode check at most once per
+# _INODE_CHECK_INTERVAL seconds).
+_LOG_FD: Optional[int] = None
+_LOG_FD_PATH: Optional[str] = None
+_LOG_FD_CHECKED = 0.0
+_INODE_CHECK_INTERVAL = 1.0
+_LOG_LOCK = threading.Lock()
+_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+
+def _close_log_fd() -> None:
+    global _LOG_FD, _LOG_FD_PATH
+    with _LOG_LOCK:
+        if _LOG_FD is not None:
+            try:
+                os.close(_LOG_FD)
+            except OSError:
+                pass
+        _LOG_FD = None
+        _LOG_FD_PATH = None
+
+
+atexit.register(_close_log_fd)
+
+
+def _fd_is_stale(fd: int, path: str) -> bool:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return True
+    fst = os.fstat(fd)
+    return (st.st_ino, st.st_dev) != (fst.st_ino, fst.st_dev)
+
+
+# Path object for the log file, rebuilt only when the configured string changes
+_LOG_PATH: Optional[Path] = None
+_LOG_PATH_SRC: Optional[str] = None
+
+
+def _log_path(src: str) -> Path:
+    global _LOG_PATH, _LOG_PATH_SRC
+    if _LOG_PATH is None or _LOG_PATH_SRC != src:
+        _LOG_PATH = Path(src)
+        _LOG_PATH_SRC = src
+    return _LOG_PATH
+
+
+def _append_bytes(path: "str | os.PathLike[str]", data: bytes) -> None:
+    global _LOG_FD, _LOG_FD_PATH, _LOG_FD_CHECKED
+    key = os.fspath(path)
+    with _LOG_LOCK:
+        now = time.monotonic()
+        reopen = _LOG_FD is None or _LOG_FD_PATH != key
+        if not reopen and now - _LOG_FD_CHECKED >= _INODE_CHECK_INTERVAL:
+            reopen = _fd_is_stale(_LOG_FD, key)
+            _LOG_FD_CHECKED = now
+        if reopen:
+            if _LOG_FD is not None:
+                try:
+                    os.close(_LOG_FD)
+                except OSError:
+                    pass
+                _LOG_FD = None
+            # Path is only needed here, to create the parent directory
+            log_path = _log_path(key)
+            _ensure_parent_dir(log_path)
+            try:
+                _LOG_FD = os.open(key, _OPEN_FLAGS, 0o644)
+            except FileNotFoundError:
+                # Directory removed since it was marked ready
+                _DIR_READY.discard(log_path.parent)
+                _ensure_parent_dir(log_path)
+                _LOG_FD = os.open(key, _OPEN_FLAGS, 0o644)
+            _LOG_FD_PATH = key
+            _LOG_FD_CHECKED = now
+        # O_APPEND: every write lands at the current end of file
+        view = memoryview(data)
+        while view:
+            view = view[os.write(_LOG_FD, view):]
+
+
+_QUEUE_MAX = 10000
+_BATCH_MAX = 256
+
+
+class _LogWorker:
+    """Single daemon thread draining queued (path, line) items in batches."""
+
+    def __init__(self) -> None:
+        self.queue: "queue.Queue[Tuple[str, bytes]]" = queue.Queue(maxsize=_QUEUE_MAX)
+        self.thread = threading.Thread(target=self._run, name="llm-log-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < _BATCH_MAX:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    @staticmethod
+    def _write(batch: List[Tuple[str, bytes]]) -> None:
+        # One write per run of lines sharing a path (the path rarely changes)
+        start = 0
+        for i in range(1, len(batch) + 1):
+            if i == len(batch) or batch[i][0] != batch[start][0]:
+                try:
+                    _append_bytes(batch[start][0], b"".join(line for _, line in batch[start:i]))
+                except Exception:
+                    # Never break the app on logging failures
+                    pass
+                start = i
+
+
+_WORKER: Optional[_LogWorker] = None
+_WORKER_LOCK = threading.Lock()
+
+
+def _enqueue_line(path: str, line: bytes) -> None:
+    global _WORKER
+    worker = _WORKER
+    if worker is None:
+        with _WORKER_LOCK:
+            if _WORKER is None:
+                _WORKER = _LogWorker()
+                atexit.register(flush_llm_log)
+            worker = _WORKER
+    try:
+        worker.queue.put_nowait((path, line))
+    except queue.Full:
+        # Writer is behind: write inline rather than drop the line
+        _append_bytes(path, line)
+
+
+def flush_llm_log() -> None:
+    """Block until every queued log line has been written."""
+    worker = _WORKER
+    if worker is not None:
+        worker.queue.join()
+
+
+# Per-(run_id, provider) [calls, tokens], counted in memory by log_call and
+# written to the run's own database by flush_usage()
+_USAGE: Dict[Tuple[str, str], List[int]] = {}
+_USAGE_LOCK = threading.Lock()
+
+
+def _add_usage(run_id: str, provider: str, calls: int, tokens: int) -> None:
+    with _USAGE_LOCK:
+        bucket = _USAGE.setdefault((run_id, provider), [0, 0])
+        bucket[0] += calls
+        bucket[1] += tokens
+
+
+def _count_usage(run_id: str, provider: str, usage: Optional[Dict[str, Any]]) -> None:
+    try:
+        tokens = int((usage or {}).get("total_tokens") or 0)
+    except Exception:
+        tokens = 0
+    _add_usage(run_id, provider or "unknown", 1, tokens)
+
+
+def pending_usage(run_id: str) -> Dict[str, Dict[str, int]]:
+    """Usage for run_id counted in this process and not yet flushed."""
+    with _USAGE_LOCK:
+        return {
+            provider: {"calls": calls, "tokens": tokens}
+            for (rid, provider), (calls, tokens) in _USAGE.items()
+            if rid == run_id
+        }
+
+
+def flush_usage(conn: sqlite3.Connection, run_id: Optional[str] = None) -> None:
+    """Move run_id's in-memory usage (default: current RUN_ID) into conn's llm_usage_agg."""
+    run_id = run_id or _RUN_ID
+    if not run_id:
+        return
+    with _USAGE_LOCK:
+        keys = [key for key in _USAGE if key[0] == run_id]
+        rows = [(run_id, provider, *_USAGE.pop((run_id, provider))) for _, provider in keys]
+    if not rows:
+        return
+    from db.repos.llm_usage_repo import LLMUsageRepo
+    try:
+        LLMUsageRepo(conn).add_usage_many(rows)
+    except Exception:
+        # Keep the counts for a later flush rather than losing them
+        for rid, provider, calls, tokens in rows:
+            _add_usage(rid, provider, calls, tokens)
+        raise
+
+
+# (llm_trace, llm_log_path) resolved from settings on first log_call
+_TRACE_CFG: Optional[Tuple[bool, str]] = None
+
+
+def _resolve_cfg() -> Tuple[bool, str]:
+    global _TRACE_CFG
+    settings = get_settings()
+    _TRACE_CFG = (bool(settings.llm_trace), str(settings.llm_log_path))
+    return _TRACE_CFG
+
+
+# RUN_ID captured once; cli's cmd_run sets it and calls refresh_run_id()
+_RUN_ID: Optional[str] = os.getenv("RUN_ID")
+
+
+def refresh_run_id() -> Optional[str]:
+    """Re-read RUN_ID from the environment (after it was set or changed)."""
+    global _RUN_ID
+    _RUN_ID = os.getenv("RUN_ID")
+    return _RUN_ID
+
+
+def reset_llm_logger_cache() -> None:
+    """Re-read trace settings (and rebind log_call) so env changes apply (used by tests)."""
+    global _TRACE_CFG, log_call
+    _TRACE_CFG = None
+    invalidate_settings_cache()
+    refresh_run_id()
+    log_call = _first_log_call
+
+
+def _fmt_iso(ns: int) -> str:
+    """UTC epoch nanoseconds -> ISO 8601 with microseconds (datetime.isoformat() layout)."""
+    secs, rem = divmod(ns, 1_000_000_000)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs)) + f".{rem // 1000:06d}+00:00"
+
+
+@lru_cache(maxsize=4096)
+def _sha256_hex(text: str) -> str:
+    # Keyed on the full text: prompt templates repeat across calls
+    return hashlib.sha256(text.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
 def sha256_text(text: Optional[str]) -> Optional[str]:
     if not text:
         return None
     try:
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return _sha256_hex(text)
     except Exception:
         return None
 
 
-def log_call(
+def _log_call(
     *,
     caller: str,
     provider: str,
@@ -47,23 +318,19 @@ def log_call(
 ) -> None:
     """Append a single JSON line describing an LLM call if tracing is enabled.
 
-    Controlled by settings in config/settings.py
+    Controlled by settings in config/settings.py (resolved once; see
+    reset_llm_logger_cache). Callers go through the module attribute
+    log_call, which is bound to a no-op while tracing is disabled.
     """
-    from config.settings import get_settings
-    try:
-        # Ensure latest env changes (tests may monkeypatch env between calls)
-        get_settings.cache_clear()  # type: ignore[attr-defined]
-    except Exception:
-        pass
-    settings = get_settings()
-    if not settings.llm_trace:
+    enabled, log_path = _TRACE_CFG or _resolve_cfg()
+    if not enabled:
         return
 
-    log_path = Path(settings.llm_log_path)
-    _ensure_parent_dir(log_path)
-
+    run_id = _RUN_ID
+    # Fixed fields as one literal in output order; run_id and extras are
+    # appended only when present. Extras stay under their own key.
     payload: Dict[str, Any] = {
-        "ts": datetime.now(timezone.utc).isoformat(),
+        "ts": _fmt_iso(time.time_ns()),
         "caller": caller,
         "provider": provider,
         "model": model,
@@ -75,20 +342,45 @@ def log_call(
         "error": error,
         "usage": usage or {},
     }
-    # Include run metadata if present
-    import os
-    run_id = os.getenv("RUN_ID")
     if run_id:
         payload["run_id"] = run_id
-
     if extras:
-        # Shallow merge extras under a dedicated key to avoid collisions
         payload["extras"] = extras
 
     try:
-        with log_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        _enqueue_line(log_path, _dumps_line(payload))
     except Exception:
         # Never break the app on logging failures
         return
 
+    if run_id:
+        # In-memory only; the CLI flushes into the run's DB (flush_usage)
+        _count_usage(run_id, provider, usage)
+
+
+def _noop_log_call(**_kwargs: Any) -> None:
+    return None
+
+
+def _first_log_call(**kwargs: Any) -> None:
+    """Resolve trace settings on first use, rebind log_call, then log this call.
+
+    Settings are not read at import, so env set by the CLI or tests before the
+    first LLM call still decides whether tracing is on.
+    """
+    global log_call
+    enabled = (_TRACE_CFG or _resolve_cfg())[0]
+    log_call = _log_call if enabled else _noop_log_call
+    log_call(**kwargs)
+
+
+# Bound lazily: with LLM_TRACE off, later calls cost a bare no-op call
+log_call: Callable[..., None] = _first_log_call
+
+
+def enable() -> None:
+    """Turn tracing on for this process (the log path still comes from settings)."""
+    global _TRACE_CFG, log_call
+    _, log_path = _TRACE_CFG or _resolve_cfg()
+    _TRACE_CFG = (True, log_path)
+    log_call = _log_call
@@ -9,9 +9,15 @@ from config.settings import get_settings
 
 _INITIALIZED: bool = False
 
+_LOG_FORMAT = (
+    "%(asctime)s %(levelname)s %(name)s %(message)s "
+    "step=%(step)s status=%(status)s duration_ms=%(duration_ms)s "
+    "provider=%(provider)s error=%(error)s run_id=%(run_id)s"
+)
 
-class SafeExtraFormatter(logging.Formatter):
-    """Formatter that tolerates missing extra fields by injecting defaults."""
+
+class DefaultsFilter(logging.Filter):
+    """Handler filter that stamps default values for missing extra fields."""
 
     DEFAULTS: dict[str, Any] = {
         "step": "-",
@@ -22,11 +28,11 @@ class SafeExtraFormatter(logging.Formatter):
         "run_id": "-",
     }
 
-    def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
+    def filter(self, record: logging.LogRecord) -> bool:  # type: ignore[override]
+        d = record.__dict__
         for key, value in self.DEFAULTS.items():
-            if not hasattr(record, key):
-                setattr(record, key, value)
-        return super().format(record)
+            d.setdefault(key, value)
+        return True
 
 
 def init_logging(level: str | None = None) -> None:
@@ -44,14 +50,9 @@ def init_logging(level: str | None = None) -> None:
     if not root_logger.handlers:
         handler = logging.StreamHandler(sys.stdout)
         handler.setLevel(log_level)
-        formatter = SafeExtraFormatter(
-            fmt=(
-                "%(asctime)s %(levelname)s %(name)s %(message)s "
-                "step=%(step)s status=%(status)s duration_ms=%(duration_ms)s "
-                "provider=%(provider)s error=%(error)s run_id=%(run_id)s"
-            )
-        )
-        handler.setFormatter(formatter)
+        handler.addFilter(DefaultsFilter())
+        # Fixed, known-good format: skip Formatter's field validation
+        handler.setFormatter(logging.Formatter(fmt=_LOG_FORMAT, style="%", validate=False))
         root_logger.addHandler(handler)
 
     _INITIALIZED = True
@@ -1,6 +1,35 @@
 from __future__ import annotations
 
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional
+
+
+_SHORTHAND_RE = re.compile(r"^([0-9]+(?:\.[0-9]+)?)([KMB]?)$")
+_DIGITS_RE = re.compile(r"\d+")
+# Deletes every Latin-1 character except ASCII 0-9
+_KEEP_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if not 48 <= c <= 57))
+_FACTOR = {'': 1, 'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+
+@lru_cache(maxsize=1024)
+def _parse_cached(s: str) -> Optional[int]:
+    """Parse a stripped, upper-cased shorthand string (scraped values repeat a lot)."""
+    if not s:
+        return None
+    try:
+        if s.endswith('+'):
+            s = s[:-1]
+        m = _SHORTHAND_RE.match(s)
+        if m:
+            return int(round(float(m.group(1)) * _FACTOR[m.group(2)]))
+        digits = s.translate(_KEEP_DIGITS)
+        if not digits.isascii():
+            # Characters beyond Latin-1 survive the table; rare, use the regex
+            digits = ''.join(_DIGITS_RE.findall(s))
+        return int(digits) if digits else None
+    except Exception:
+        return None
 
 
 def _parse_int_shorthand(value) -> Optional[int]:
@@ -11,30 +40,16 @@ def _parse_int_shorthand(value) -> Optional[int]:
     if value is None:
         return None
     try:
-        s = str(value).strip().upper()
-        if not s:
-            return None
-        if s.endswith('+'):
-            s = s[:-1]
-        import re as _re
-        m = _re.match(r"^([0-9]+(?:\.[0-9]+)?)([KMB]?)$", s)
-        if m:
-            num = float(m.group(1))
-            suf = m.group(2)
-            factor = 1
-            if suf == 'K':
-                factor = 1000
-            elif suf == 'M':
-                factor = 1000000
-            elif suf == 'B':
-                factor = 1000000000
-            return int(round(num * factor))
-        digits = ''.join(ch for ch in s if ch.isdigit())
-        return int(digits) if digits else None
+        return _parse_cached(str(value).strip().upper())
     except Exception:
         return None
 
 
+def _parse_int_shorthand_many(values: Iterable[Any]) -> List[Optional[int]]:
+    """Column-wise _parse_int_shorthand; repeated values hit the _parse_cached memo."""
+    return [_parse_int_shorthand(v) for v in values]
+
+
 def _parse_connections(value) -> Optional[int]:
     parsed = _parse_int_shorthand(value)
     if parsed is None: